@@ -11,8 +11,9 @@ from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
 from decimal import Decimal
 from web3 import Web3
+from eth_abi import encode as abi_encode
 from eth_account import Account
-from .utils import NonceManager, eip1559_gas_fields
+from .utils import NonceManager, BatchRPC, eip1559_gas_fields
 
 logger = logging.getLogger(__name__)
 
@@ -245,6 +246,27 @@ QUOTER_V3_ABI = [
     }
 ]
 
+# Raw selectors for batched quotes (Multicall3 calldata, без contract-объектов)
+GET_AMOUNTS_OUT_SELECTOR = Web3.keccak(text="getAmountsOut(uint256,address[])")[:4]
+QUOTE_EXACT_INPUT_SINGLE_SELECTOR = Web3.keccak(
+    text="quoteExactInputSingle((address,address,uint256,uint24,uint160))"
+)[:4]
+
+
+def _decode_amounts_out_last(data: bytes) -> int:
+    """Последний элемент uint256[] из getAmountsOut (без полного ABI-декодирования)."""
+    if len(data) < 96:
+        return 0
+    return int.from_bytes(data[-32:], 'big')
+
+
+def _decode_first_uint256(data: bytes) -> int:
+    """amountOut — первое слово ответа quoteExactInputSingle."""
+    if len(data) < 32:
+        return 0
+    return int.from_bytes(data[:32], 'big')
+
+
 # ERC20 ABI
 ERC20_ABI = [
     {"constant": True, "inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "type": "function"},
@@ -770,6 +792,114 @@ class DexSwap:
 
         return (best_out, best_fee, best_fee2)
 
+    def get_quotes_batch(
+        self,
+        items: List[Tuple[str, int]],
+        to_token: str,
+        include_v2: bool = True,
+        include_v3: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Котировки V2/V3 для нескольких токенов через Multicall3.
+
+        Те же маршруты, что у get_quote / get_quote_v3 (прямой путь и через WETH),
+        но вместо десятков отдельных eth_call — два запроса: прямые котировки
+        вместе с первым хопом V3, затем второй хоп WETH -> to_token.
+        V2 выбирает прямой путь, если он дал котировку, иначе путь через WETH.
+
+        Args:
+            items: Список (from_token, amount_in)
+            to_token: Адрес выходного токена
+
+        Returns:
+            Список dict {'v2': amount_out, 'v3': (amount_out, fee, fee2)} в порядке items
+        """
+        to_token = Web3.to_checksum_address(to_token)
+        weth = self.weth_address
+        use_v3 = include_v3 and self.v3_available
+        results = [{'v2': 0, 'v3': (0, 0, 0)} for _ in items]
+        if not items:
+            return results
+
+        def _v2_call(amount: int, path: list) -> bytes:
+            return GET_AMOUNTS_OUT_SELECTOR + abi_encode(['uint256', 'address[]'], [amount, path])
+
+        def _v3_call(token_in: str, token_out: str, amount: int, fee: int) -> bytes:
+            return QUOTE_EXACT_INPUT_SINGLE_SELECTOR + abi_encode(
+                ['(address,address,uint256,uint24,uint160)'],
+                [(token_in, token_out, amount, fee, 0)],
+            )
+
+        # Проход 1: V2 (прямой + WETH), V3 по всем fee, первый хоп V3 через WETH
+        batch = BatchRPC(self.w3)
+        slots = []  # (item_index, kind, extra)
+        for idx, (from_token, amount_in) in enumerate(items):
+            from_token = Web3.to_checksum_address(from_token)
+            via_weth = from_token.lower() != weth.lower() and to_token.lower() != weth.lower()
+            if include_v2:
+                batch.add_call(self.router_address, _v2_call(amount_in, [from_token, to_token]),
+                               _decode_amounts_out_last)
+                slots.append((idx, 'v2_direct', None))
+                if via_weth:
+                    batch.add_call(self.router_address, _v2_call(amount_in, [from_token, weth, to_token]),
+                                   _decode_amounts_out_last)
+                    slots.append((idx, 'v2_weth', None))
+            if use_v3:
+                for fee_tier in self.fee_tiers:
+                    batch.add_call(self.quoter_v3_address, _v3_call(from_token, to_token, amount_in, fee_tier),
+                                   _decode_first_uint256)
+                    slots.append((idx, 'v3', fee_tier))
+                if via_weth:
+                    for fee1 in self.fee_tiers[:2]:
+                        batch.add_call(self.quoter_v3_address, _v3_call(from_token, weth, amount_in, fee1),
+                                       _decode_first_uint256)
+                        slots.append((idx, 'v3_hop1', fee1))
+
+        try:
+            outputs = batch.execute()
+        except Exception as e:
+            logger.error(f"Batched quotes failed: {e}")
+            return results
+
+        v2_weth = {}
+        hop1 = []  # (item_index, fee1, weth_amount)
+        for (idx, kind, extra), out in zip(slots, outputs):
+            out = out or 0
+            if out <= 0:
+                continue
+            if kind == 'v2_direct':
+                results[idx]['v2'] = out
+            elif kind == 'v2_weth':
+                v2_weth[idx] = out
+            elif kind == 'v3':
+                if out > results[idx]['v3'][0]:
+                    results[idx]['v3'] = (out, extra, 0)
+            else:
+                hop1.append((idx, extra, out))
+        for idx, out in v2_weth.items():
+            if results[idx]['v2'] <= 0:
+                results[idx]['v2'] = out
+
+        # Проход 2: второй хоп WETH -> to_token
+        if hop1:
+            batch = BatchRPC(self.w3)
+            hop2_slots = []
+            for idx, fee1, weth_amount in hop1:
+                for fee2 in self.fee_tiers[:2]:
+                    batch.add_call(self.quoter_v3_address, _v3_call(weth, to_token, weth_amount, fee2),
+                                   _decode_first_uint256)
+                    hop2_slots.append((idx, fee1, fee2))
+            try:
+                outputs = batch.execute()
+            except Exception as e:
+                logger.warning(f"Batched V3 multi-hop quotes failed: {e}")
+                outputs = []
+            for (idx, fee1, fee2), out in zip(hop2_slots, outputs):
+                if out and out > results[idx]['v3'][0]:
+                    results[idx]['v3'] = (out, fee1, fee2)
+
+        return results
+
     def swap_v3(
         self,
         from_token: str,
@@ -1107,10 +1237,13 @@ class DexSwap:
 
     # ── KyberSwap Aggregator methods ──
 
-    def get_kyber_quote(self, from_token: str, to_token: str, amount_in: int):
+    def get_kyber_quote(self, from_token: str, to_token: str, amount_in: int, to_decimals: int = None):
         """
         Получить котировку через KyberSwap Aggregator.
 
+        Args:
+            to_decimals: Decimals выходного токена, если уже известны (без лишнего eth_call)
+
         Returns:
             KyberQuote или None если KyberSwap недоступен / ошибка
         """
@@ -1120,7 +1253,8 @@ class DexSwap:
             quote = self.kyber_client.get_quote(from_token, to_token, amount_in)
             # Дополнить amount_out_human decimals выходного токена
             try:
-                to_decimals = self.get_token_decimals(to_token)
+                if to_decimals is None:
+                    to_decimals = self.get_token_decimals(to_token)
                 quote.amount_out_human = quote.amount_out / (10 ** to_decimals)
             except Exception:
                 pass
@@ -15,6 +15,7 @@ Docs: https://docs.kyberswap.com/kyberswap-solutions/kyberswap-aggregator
 import base64
 import logging
 from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
 from typing import Optional
 from urllib.parse import urlparse, unquote
 
@@ -34,6 +35,11 @@ KYBER_CHAIN_SLUGS = {
 KYBER_BASE_URL = "https://aggregator-api.kyberswap.com"
 KYBER_CLIENT_ID = "bnb-ladder"
 
+# Размер пула keep-alive соединений: параллельные котировки (предпросмотр свапа)
+# не должны выбрасывать соединения из пула и заново делать TLS handshake.
+# urllib3 по умолчанию держит 10 соединений на хост.
+KYBER_HTTP_POOL_SIZE = 16
+
 # Whitelist известных KyberSwap роутеров (защита от подмены адреса)
 KYBER_KNOWN_ROUTERS = {
     "0x6131b5fae19ea4f9d964eac0408e4408b66337b5",  # MetaAggregationRouterV2 (все сети)
@@ -122,7 +128,8 @@ class KyberSwapClient:
         # Отправить TX: {to: build.router_address, data: build.encoded_data}
     """
 
-    def __init__(self, chain_id: int, timeout: float = 15.0, proxy: dict = None):
+    def __init__(self, chain_id: int, timeout: float = 15.0, proxy: dict = None,
+                 pool_maxsize: int = KYBER_HTTP_POOL_SIZE):
         if chain_id not in KYBER_CHAIN_SLUGS:
             raise KyberSwapError(f"Unsupported chain_id: {chain_id}")
         self.chain_id = chain_id
@@ -130,18 +137,20 @@ class KyberSwapClient:
         self.timeout = timeout
         self.session = requests.Session()
         self.session.trust_env = False  # Не использовать системные прокси (OS/env)
+        # API без состояния: cookies не храним — у потоков котировок нет общего изменяемого состояния
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
         self.session.headers.update({
             "X-Client-Id": KYBER_CLIENT_ID,
             "Accept": "application/json",
         })
+        auth_header = None
         if proxy:
             self.session.proxies.update(proxy)
             # Явно задать Proxy-Authorization для HTTPS CONNECT tunnel
             auth_header = self._extract_proxy_auth(proxy)
-            if auth_header:
-                adapter = _ProxyAuthAdapter(proxy_basic_auth=auth_header)
-                self.session.mount('http://', adapter)
-                self.session.mount('https://', adapter)
+        adapter = _ProxyAuthAdapter(proxy_basic_auth=auth_header, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def close(self):
         """Close the HTTP session to release resources."""
@@ -5,5 +5,7 @@ from .distribution import (
     calculate_bid_ask_from_percent,
     calculate_two_sided_distribution,
     BidAskPosition,
+    LadderStats,
+    ladder_stats,
     print_distribution
 )
@@ -41,6 +41,39 @@ class BidAskPosition:
     side: str = "bid"             # "bid" (стейбл вниз) / "ask" (volatile вверх)
 
 
+@dataclass(frozen=True)
+class LadderStats:
+    """Агрегаты лесенки — считаются один раз и переиспользуются таблицей и графиком."""
+    total_usd: float              # Сумма usd_amount
+    max_usd: float                # Максимальная usd_amount (0 если позиций нет)
+    min_price_lower: float        # Нижняя граница лесенки
+    max_price_upper: float        # Верхняя граница лесенки
+
+
+def ladder_stats(positions: List[BidAskPosition]) -> LadderStats:
+    """
+    Посчитать агрегаты лесенки за один проход.
+
+    Для пустого списка все поля 0.
+    """
+    if not positions:
+        return LadderStats(0.0, 0.0, 0.0, 0.0)
+    total_usd = 0.0
+    max_usd = 0.0
+    min_price = math.inf
+    max_price = -math.inf
+    for p in positions:
+        usd = p.usd_amount
+        total_usd += usd
+        if usd > max_usd:
+            max_usd = usd
+        if p.price_lower < min_price:
+            min_price = p.price_lower
+        if p.price_upper > max_price:
+            max_price = p.price_upper
+    return LadderStats(total_usd, max_usd, min_price, max_price)
+
+
 DistributionType = Literal["linear", "quadratic", "exponential", "fibonacci"]
 
 
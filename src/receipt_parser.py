@@ -12,24 +12,16 @@ logger = logging.getLogger(__name__)
 TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
 
 
-def parse_close_receipt(
-    receipt: dict,
-    wallet_address: str,
-    token0: str,
-    token1: str,
-) -> dict[str, int]:
-    """Parse ERC20 Transfer events TO wallet from close TX receipt.
+def _topic_address(topic) -> str:
+    """Lowercased address from an indexed address topic (bytes or hex string)."""
+    if isinstance(topic, bytes):
+        return "0x" + topic.hex()[-40:]
+    return ("0x" + str(topic).replace("0x", "")[-40:]).lower()
 
-    Returns dict: {token0_lower: amount_wei, token1_lower: amount_wei}
-    Amounts include both liquidity withdrawal and collected fees.
-    """
-    wallet_lower = wallet_address.lower()
-    t0_lower = token0.lower()
-    t1_lower = token1.lower()
-    received = {t0_lower: 0, t1_lower: 0}
 
-    logs = receipt.get("logs", [])
-    for log in logs:
+def _iter_transfers(receipt: dict):
+    """Yield (token_lower, from_lower, to_lower, amount_wei) per ERC20 Transfer log."""
+    for log in receipt.get("logs", []):
         topics = log.get("topics", [])
         if len(topics) < 3:
             continue
@@ -40,22 +32,7 @@ def parse_close_receipt(
         if topic0 != TRANSFER_TOPIC:
             continue
 
-        # Extract 'to' address from topics[2]
-        raw_to = topics[2]
-        if isinstance(raw_to, bytes):
-            to_addr = "0x" + raw_to.hex()[-40:]
-        else:
-            to_addr = "0x" + str(raw_to).replace("0x", "")[-40:]
-
-        if to_addr.lower() != wallet_lower:
-            continue
-
-        # Extract token address from log
-        token_addr = log.get("address", "").lower()
-        if token_addr not in received:
-            continue
-
-        # Extract amount from data
+        # Amount from data
         data = log.get("data", "0x")
         if isinstance(data, bytes):
             amount = int.from_bytes(data, "big")
@@ -64,7 +41,33 @@ def parse_close_receipt(
         else:
             amount = 0
 
-        received[token_addr] += amount
+        yield (
+            log.get("address", "").lower(),
+            _topic_address(topics[1]),
+            _topic_address(topics[2]),
+            amount,
+        )
+
+
+def parse_close_receipt(
+    receipt: dict,
+    wallet_address: str,
+    token0: str,
+    token1: str,
+) -> dict[str, int]:
+    """Parse ERC20 Transfer events TO wallet from close TX receipt.
+
+    Returns dict: {token0_lower: amount_wei, token1_lower: amount_wei}
+    Amounts include both liquidity withdrawal and collected fees.
+    """
+    wallet_lower = wallet_address.lower()
+    t0_lower = token0.lower()
+    t1_lower = token1.lower()
+    received = {t0_lower: 0, t1_lower: 0}
+
+    for token_addr, _, to_addr, amount in _iter_transfers(receipt):
+        if to_addr == wallet_lower and token_addr in received:
+            received[token_addr] += amount
 
     logger.info(
         f"parse_close_receipt: wallet={wallet_lower[:10]}... "
@@ -74,6 +77,29 @@ def parse_close_receipt(
     return received
 
 
+def parse_received_amounts(
+    receipts: list,
+    wallet_address: str,
+    tokens,
+) -> dict[str, int]:
+    """Sum ERC20 Transfer events TO wallet across several close TX receipts.
+
+    Unlike parse_close_receipt this is not tied to one token pair, so a token
+    shared by several pools (e.g. USDT) is counted once per transfer.
+
+    Returns dict: {token_lower: amount_wei} for every token in `tokens`.
+    """
+    wallet_lower = wallet_address.lower()
+    received = {t.lower(): 0 for t in tokens}
+
+    for receipt in receipts:
+        for token_addr, _, to_addr, amount in _iter_transfers(receipt):
+            if to_addr == wallet_lower and token_addr in received:
+                received[token_addr] += amount
+
+    return received
+
+
 def parse_swap_receipt(
     receipt: dict,
     wallet_address: str,
@@ -87,40 +113,9 @@ def parse_swap_receipt(
     stable_lower = stablecoin_address.lower()
     total = 0
 
-    logs = receipt.get("logs", [])
-    for log in logs:
-        topics = log.get("topics", [])
-        if len(topics) < 3:
-            continue
-
-        topic0 = topics[0]
-        if isinstance(topic0, str):
-            topic0 = bytes.fromhex(topic0.replace("0x", ""))
-        if topic0 != TRANSFER_TOPIC:
-            continue
-
-        token_addr = log.get("address", "").lower()
-        if token_addr != stable_lower:
-            continue
-
-        raw_to = topics[2]
-        if isinstance(raw_to, bytes):
-            to_addr = "0x" + raw_to.hex()[-40:]
-        else:
-            to_addr = "0x" + str(raw_to).replace("0x", "")[-40:]
-
-        if to_addr.lower() != wallet_lower:
-            continue
-
-        data = log.get("data", "0x")
-        if isinstance(data, bytes):
-            amount = int.from_bytes(data, "big")
-        elif data and data != "0x":
-            amount = int(data, 16)
-        else:
-            amount = 0
-
-        total += amount
+    for token_addr, _, to_addr, amount in _iter_transfers(receipt):
+        if token_addr == stable_lower and to_addr == wallet_lower:
+            total += amount
 
     logger.info(
         f"parse_swap_receipt: wallet={wallet_lower[:10]}... "
@@ -142,41 +137,9 @@ def parse_swap_volatile_sent(
     volatile_lower = volatile_token_address.lower()
     total = 0
 
-    logs = receipt.get("logs", [])
-    for log in logs:
-        topics = log.get("topics", [])
-        if len(topics) < 3:
-            continue
-
-        topic0 = topics[0]
-        if isinstance(topic0, str):
-            topic0 = bytes.fromhex(topic0.replace("0x", ""))
-        if topic0 != TRANSFER_TOPIC:
-            continue
-
-        token_addr = log.get("address", "").lower()
-        if token_addr != volatile_lower:
-            continue
-
-        # Check 'from' is wallet (topics[1])
-        raw_from = topics[1]
-        if isinstance(raw_from, bytes):
-            from_addr = "0x" + raw_from.hex()[-40:]
-        else:
-            from_addr = "0x" + str(raw_from).replace("0x", "")[-40:]
-
-        if from_addr.lower() != wallet_lower:
-            continue
-
-        data = log.get("data", "0x")
-        if isinstance(data, bytes):
-            amount = int.from_bytes(data, "big")
-        elif data and data != "0x":
-            amount = int(data, 16)
-        else:
-            amount = 0
-
-        total += amount
+    for token_addr, from_addr, _, amount in _iter_transfers(receipt):
+        if token_addr == volatile_lower and from_addr == wallet_lower:
+            total += amount
 
     logger.info(
         f"parse_swap_volatile_sent: wallet={wallet_lower[:10]}... "
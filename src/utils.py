@@ -661,6 +661,8 @@ class BatchRPC:
         )
         self._calls: List[BatchCall] = []
         self._decoders: List[callable] = []
+        # (account_address, encoded 32-byte word) of the last balanceOf holder
+        self._balance_account: Optional[Tuple[str, bytes]] = None
 
     def add_call(self, target: str, call_data: bytes, decoder: callable = None, allow_failure: bool = True):
         """
@@ -681,13 +683,15 @@ class BatchRPC:
 
     def add_balance_of(self, token_address: str, account_address: str):
         """Add a balanceOf call."""
-        token = self.w3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_MINIMAL_ABI
-        )
-        call_data = token.functions.balanceOf(
-            Web3.to_checksum_address(account_address)
-        )._encode_transaction_data()
+        # balanceOf(address) selector = 0x70a08231 — raw encoding, no per-token
+        # contract object. The holder is validated/normalized once per batch:
+        # balances are usually batched for one wallet across many tokens.
+        if self._balance_account is None or self._balance_account[0] != account_address:
+            checksummed = Web3.to_checksum_address(account_address)
+            self._balance_account = (
+                account_address, bytes.fromhex(checksummed[2:]).rjust(32, b'\x00')
+            )
+        call_data = bytes.fromhex('70a08231') + self._balance_account[1]
 
         def decode_uint256(data: bytes) -> int:
             if len(data) >= 32:
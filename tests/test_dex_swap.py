@@ -652,6 +652,102 @@ class TestGetQuoteV3:
         assert result == (0, 0, 0)
 
 
+# ============================================================
+# get_quotes_batch tests (Multicall3)
+# ============================================================
+
+def _fake_aggregate3(swapper, v2_paths=None, v3_pairs=None):
+    """aggregate3 stub: answers router/quoter calldata from lookup tables.
+
+    v2_paths: {tuple(path): amount_out}; v3_pairs: {(token_in, token_out, fee): amount_out}.
+    Missing entries revert (success=False), like a pool without liquidity.
+    """
+    from eth_abi import decode, encode
+    from src.dex_swap import GET_AMOUNTS_OUT_SELECTOR, QUOTE_EXACT_INPUT_SINGLE_SELECTOR
+    v2_paths = v2_paths or {}
+    v3_pairs = v3_pairs or {}
+    batches = []
+
+    def aggregate3(calls):
+        batches.append(calls)
+        out = []
+        for target, _allow, data in calls:
+            if data[:4] == GET_AMOUNTS_OUT_SELECTOR:
+                amount, path = decode(['uint256', 'address[]'], data[4:])
+                key = tuple(Web3.to_checksum_address(a) for a in path)
+                if key in v2_paths:
+                    amounts = [amount] * (len(path) - 1) + [v2_paths[key]]
+                    out.append((True, encode(['uint256[]'], [amounts])))
+                    continue
+            elif data[:4] == QUOTE_EXACT_INPUT_SINGLE_SELECTOR:
+                (token_in, token_out, _amount, fee, _limit), = decode(
+                    ['(address,address,uint256,uint24,uint160)'], data[4:])
+                key = (Web3.to_checksum_address(token_in), Web3.to_checksum_address(token_out), fee)
+                if key in v3_pairs:
+                    out.append((True, encode(['uint256', 'uint160', 'uint32', 'uint256'],
+                                             [v3_pairs[key], 0, 0, 0])))
+                    continue
+            out.append((False, b''))
+        return MagicMock(call=MagicMock(return_value=out))
+
+    return aggregate3, batches
+
+
+class TestGetQuotesBatch:
+
+    def test_v2_direct_preferred_over_weth(self):
+        swapper, w3 = _make_swapper(56)
+        aggregate3, _ = _fake_aggregate3(swapper, v2_paths={
+            (TOKEN_VOLATILE, USDT_BSC): 700,
+            (TOKEN_VOLATILE, WBNB, USDT_BSC): 900,
+        })
+        w3.eth.contract.return_value.functions.aggregate3 = aggregate3
+
+        result = swapper.get_quotes_batch([(TOKEN_VOLATILE, 10**18)], USDT_BSC, include_v3=False)
+        assert result == [{'v2': 700, 'v3': (0, 0, 0)}]
+
+    def test_v2_falls_back_to_weth_path(self):
+        swapper, w3 = _make_swapper(56)
+        aggregate3, _ = _fake_aggregate3(swapper, v2_paths={(TOKEN_VOLATILE, WBNB, USDT_BSC): 900})
+        w3.eth.contract.return_value.functions.aggregate3 = aggregate3
+
+        result = swapper.get_quotes_batch([(TOKEN_VOLATILE, 10**18)], USDT_BSC, include_v3=False)
+        assert result[0]['v2'] == 900
+
+    def test_v3_best_fee_and_multi_hop_in_two_round_trips(self):
+        """Direct tiers + first hop go in one multicall, second hop in another."""
+        swapper, w3 = _make_swapper(56)
+        fee_a, fee_b = swapper.fee_tiers[0], swapper.fee_tiers[1]
+        aggregate3, batches = _fake_aggregate3(swapper, v3_pairs={
+            (TOKEN_VOLATILE, USDT_BSC, fee_a): 500,
+            (TOKEN_VOLATILE, WBNB, fee_a): 10_000,
+            (WBNB, USDT_BSC, fee_b): 2000,
+        })
+        w3.eth.contract.return_value.functions.aggregate3 = aggregate3
+
+        result = swapper.get_quotes_batch([(TOKEN_VOLATILE, 10**18)], USDT_BSC, include_v2=False)
+        assert result[0]['v3'] == (2000, fee_a, fee_b)
+        assert len(batches) == 2
+
+    def test_results_keep_item_order(self):
+        swapper, w3 = _make_swapper(56)
+        other = Web3.to_checksum_address("0x" + "12" * 20)
+        aggregate3, batches = _fake_aggregate3(swapper, v2_paths={
+            (TOKEN_VOLATILE, USDT_BSC): 111,
+            (other, USDT_BSC): 222,
+        })
+        w3.eth.contract.return_value.functions.aggregate3 = aggregate3
+
+        result = swapper.get_quotes_batch(
+            [(other, 1), (TOKEN_VOLATILE, 2)], USDT_BSC, include_v3=False)
+        assert [r['v2'] for r in result] == [222, 111]
+        assert len(batches) == 1
+
+    def test_empty_items(self):
+        swapper, w3 = _make_swapper(56)
+        assert swapper.get_quotes_batch([], USDT_BSC) == []
+
+
 # ============================================================
 # swap_v3 tests
 # ============================================================
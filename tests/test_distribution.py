@@ -7,6 +7,7 @@ Tests all public and private functions:
 - calculate_bid_ask_distribution (core ladder builder)
 - calculate_two_sided_distribution (two-sided ranges)
 - calculate_bid_ask_from_percent (convenience wrapper)
+- ladder_stats (single-pass ladder aggregates)
 """
 
 import pytest
@@ -21,6 +22,8 @@ from src.math.distribution import (
     calculate_two_sided_distribution,
     calculate_bid_ask_from_percent,
     BidAskPosition,
+    LadderStats,
+    ladder_stats,
 )
 
 
@@ -1094,5 +1097,32 @@ class TestRealisticScenarios:
         assert ratio > 10  # Conservative check
 
 
+# ---------------------------------------------------------------------------
+# Ladder aggregates
+# ---------------------------------------------------------------------------
+
+class TestLadderStats:
+    """Tests for ladder_stats(positions)."""
+
+    def test_matches_separate_scans(self):
+        positions = calculate_bid_ask_distribution(
+            current_price=600.0, lower_price=400.0, total_usd=1000.0, n_positions=7,
+        )
+        stats = ladder_stats(positions)
+        assert stats.total_usd == pytest.approx(sum(p.usd_amount for p in positions))
+        assert stats.max_usd == max(p.usd_amount for p in positions)
+        assert stats.min_price_lower == min(p.price_lower for p in positions)
+        assert stats.max_price_upper == max(p.price_upper for p in positions)
+
+    def test_empty(self):
+        assert ladder_stats([]) == LadderStats(0.0, 0.0, 0.0, 0.0)
+
+    def test_unsorted_positions(self):
+        a = BidAskPosition(0, 0, 0, 5.0, 6.0, 100.0, 25.0, 0)
+        b = BidAskPosition(1, 0, 0, 9.0, 10.0, 300.0, 75.0, 0)
+        stats = ladder_stats([b, a])
+        assert stats == LadderStats(400.0, 300.0, 5.0, 10.0)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
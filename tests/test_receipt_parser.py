@@ -0,0 +1,128 @@
+"""
+Tests for src/receipt_parser.py and the close-receipt balance fallback.
+
+Covers: parse_close_receipt, parse_received_amounts, parse_swap_receipt,
+        parse_swap_volatile_sent, BalanceFetchWorker collected_amounts fallback.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from src.receipt_parser import (
+    TRANSFER_TOPIC,
+    parse_close_receipt,
+    parse_received_amounts,
+    parse_swap_receipt,
+    parse_swap_volatile_sent,
+)
+
+
+WALLET = "0x1234567890AbcdEF1234567890aBcdef12345678"
+OTHER = "0x9999999999999999999999999999999999999999"
+TOKEN_A = "0xAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+TOKEN_B = "0xBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBBB"
+TOKEN_C = "0xCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCCC"
+
+
+def _topic(address: str) -> bytes:
+    return bytes(12) + bytes.fromhex(address[2:])
+
+
+def _transfer(token: str, frm: str, to: str, amount: int, as_hex: bool = False) -> dict:
+    """Build a Transfer log; as_hex=True uses hex strings like raw JSON-RPC output."""
+    topics = [TRANSFER_TOPIC, _topic(frm), _topic(to)]
+    data = amount.to_bytes(32, "big")
+    if as_hex:
+        topics = ["0x" + t.hex() for t in topics]
+        data = "0x" + data.hex()
+    return {"address": token, "topics": topics, "data": data}
+
+
+# ---------------------------------------------------------------------------
+# Parsers
+# ---------------------------------------------------------------------------
+
+class TestParseCloseReceipt:
+    """Tests for parse_close_receipt."""
+
+    def test_sums_transfers_to_wallet(self):
+        receipt = {"logs": [
+            _transfer(TOKEN_A, OTHER, WALLET, 100),
+            _transfer(TOKEN_A, OTHER, WALLET, 5, as_hex=True),
+            _transfer(TOKEN_B, OTHER, WALLET, 7),
+            _transfer(TOKEN_B, WALLET, OTHER, 1000),  # outgoing — ignored
+            _transfer(TOKEN_C, OTHER, WALLET, 1000),  # not in the pair — ignored
+        ]}
+        received = parse_close_receipt(receipt, WALLET, TOKEN_A, TOKEN_B)
+        assert received == {TOKEN_A.lower(): 105, TOKEN_B.lower(): 7}
+
+    def test_skips_non_transfer_logs(self):
+        log = _transfer(TOKEN_A, OTHER, WALLET, 100)
+        log["topics"][0] = b"\x01" * 32
+        receipt = {"logs": [log, {"address": TOKEN_A, "topics": [TRANSFER_TOPIC], "data": "0x"}]}
+        received = parse_close_receipt(receipt, WALLET, TOKEN_A, TOKEN_B)
+        assert received == {TOKEN_A.lower(): 0, TOKEN_B.lower(): 0}
+
+
+class TestParseReceivedAmounts:
+    """Tests for parse_received_amounts."""
+
+    def test_sums_across_receipts(self):
+        receipts = [
+            {"logs": [_transfer(TOKEN_A, OTHER, WALLET, 10), _transfer(TOKEN_C, OTHER, WALLET, 1)]},
+            {"logs": [_transfer(TOKEN_C, OTHER, WALLET, 2, as_hex=True)]},
+        ]
+        received = parse_received_amounts(receipts, WALLET, [TOKEN_A, TOKEN_B, TOKEN_C])
+        assert received == {TOKEN_A.lower(): 10, TOKEN_B.lower(): 0, TOKEN_C.lower(): 3}
+
+    def test_empty(self):
+        assert parse_received_amounts([], WALLET, [TOKEN_A]) == {TOKEN_A.lower(): 0}
+
+
+class TestParseSwapReceipt:
+    """Tests for parse_swap_receipt / parse_swap_volatile_sent."""
+
+    def test_stablecoin_received(self):
+        receipt = {"logs": [
+            _transfer(TOKEN_A, OTHER, WALLET, 50),
+            _transfer(TOKEN_B, OTHER, WALLET, 999),
+        ]}
+        assert parse_swap_receipt(receipt, WALLET, TOKEN_A) == 50
+
+    def test_volatile_sent(self):
+        receipt = {"logs": [
+            _transfer(TOKEN_B, WALLET, OTHER, 30, as_hex=True),
+            _transfer(TOKEN_B, OTHER, WALLET, 999),
+        ]}
+        assert parse_swap_volatile_sent(receipt, WALLET, TOKEN_B) == 30
+
+
+# ---------------------------------------------------------------------------
+# BalanceFetchWorker fallback
+# ---------------------------------------------------------------------------
+
+class TestBalanceFetchFallback:
+    """BalanceFetchWorker uses close-receipt amounts when balanceOf fails."""
+
+    def _run(self, balances, collected):
+        from ui.manage_tab import BalanceFetchWorker
+
+        tokens = [
+            {'address': TOKEN_A, 'symbol': 'A', 'decimals': 18, 'amount': 0},
+            {'address': TOKEN_B, 'symbol': 'B', 'decimals': 18, 'amount': 0},
+        ]
+        batch = MagicMock()
+        batch.execute.return_value = balances
+        worker = BalanceFetchWorker(MagicMock(), WALLET, tokens, collected_amounts=collected)
+        emitted = []
+        worker.result.connect(emitted.append)
+        with patch("src.utils.BatchRPC", return_value=batch):
+            worker.run()
+        return emitted
+
+    def test_failed_read_uses_collected_amount(self):
+        emitted = self._run([None, 20], {TOKEN_A.lower(): 15})
+        assert [(t['address'], t['amount']) for t in emitted[0]] == [(TOKEN_A, 15), (TOKEN_B, 20)]
+
+    def test_wallet_balance_wins_when_read_succeeds(self):
+        emitted = self._run([40, None], {TOKEN_A.lower(): 15})
+        assert [(t['address'], t['amount']) for t in emitted[0]] == [(TOKEN_A, 40)]
@@ -0,0 +1,147 @@
+"""
+Tests for ui/swap_preview_dialog.py QuoteWorker.
+
+Covers: local 1:1 quotes for the output token and USD stablecoins,
+        real quotes for wrapped native tokens, per-quote Kyber timeout.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import ui.swap_preview_dialog as swap_preview
+from ui.swap_preview_dialog import QuoteWorker
+
+
+USDT = "0x55d398326f99059fF775485246999027B3197955"
+USDC = "0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d"
+WBNB = "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c"
+TOKEN = "0x1111111111111111111111111111111111111111"
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    """Quote cache and Auto source preference are module-level — reset around each test."""
+    swap_preview._QUOTE_CACHE.clear()
+    swap_preview._PREFERRED_SOURCE.clear()
+    swap_preview._OUTPUT_DECIMALS.clear()
+    yield
+    swap_preview._QUOTE_CACHE.clear()
+    swap_preview._PREFERRED_SOURCE.clear()
+    swap_preview._OUTPUT_DECIMALS.clear()
+
+
+def _make_swapper():
+    """DexSwap stand-in: Kyber quotes 300 USDT per token, on-chain finds nothing."""
+    swapper = MagicMock()
+    swapper.kyber_client = object()
+    swapper.get_token_decimals.return_value = 18
+
+    def kyber_quote(token, output, amount, to_decimals=None):
+        return MagicMock(amount_out=amount * 300, amount_out_human=amount * 300 / 10 ** 18,
+                         route_description="Kyber", price_impact=0.1)
+
+    swapper.get_kyber_quote.side_effect = kyber_quote
+    swapper.get_quotes_batch.side_effect = lambda items, *a, **kw: [
+        {'v2': 0, 'v3': (0, 0, 0)} for _ in items
+    ]
+    return swapper
+
+
+def _run_worker(tokens, swapper, output_token=USDT, swap_mode="auto"):
+    """Run QuoteWorker synchronously; return {row: quote_data}."""
+    w3 = MagicMock()
+    w3.eth.block_number = 1000
+    worker = QuoteWorker(w3, 56, tokens, output_token, swap_mode=swap_mode)
+    quotes = {}
+    worker.quotes_batch.connect(lambda batch: quotes.update(dict(batch)))
+    with patch.object(swap_preview, "_get_swapper", return_value=swapper):
+        worker.run()
+    return quotes
+
+
+class TestStableShortcut:
+    """Only the output token and USD stablecoins are priced 1:1 locally."""
+
+    def test_output_and_usd_stable_local_wbnb_quoted(self):
+        tokens = [
+            {'address': USDT, 'symbol': 'USDT', 'decimals': 18, 'amount': 5 * 10 ** 18},
+            {'address': USDC, 'symbol': 'USDC', 'decimals': 18, 'amount': 3 * 10 ** 18},
+            {'address': WBNB, 'symbol': 'WBNB', 'decimals': 18, 'amount': 2 * 10 ** 18},
+        ]
+        swapper = _make_swapper()
+        quotes = _run_worker(tokens, swapper)
+
+        assert quotes[0]['source'] == 'stable'
+        assert quotes[0]['amount_out_human'] == 5.0
+        assert quotes[1]['source'] == 'stable'
+        assert quotes[1]['amount_out_human'] == 3.0
+        # Wrapped native is in STABLE_TOKENS but is not worth $1
+        assert quotes[2]['source'] == 'KyberSwap'
+        assert quotes[2]['amount_out_human'] == 600.0
+
+        quoted = [call.args[0] for call in swapper.get_kyber_quote.call_args_list]
+        assert quoted == [WBNB]
+
+    def test_only_local_rows_make_no_quote_requests(self):
+        tokens = [
+            {'address': USDT, 'symbol': 'USDT', 'decimals': 18, 'amount': 10 ** 18},
+            {'address': TOKEN, 'symbol': 'TKN', 'decimals': 18, 'amount': 0},
+        ]
+        swapper = _make_swapper()
+        quotes = _run_worker(tokens, swapper)
+
+        assert quotes[0]['source'] == 'stable'
+        assert quotes[1]['status'] == 'skip'
+        swapper.get_kyber_quote.assert_not_called()
+        swapper.get_quotes_batch.assert_not_called()
+
+
+class TestQuoteTimeout:
+    """Each Kyber quote gets its own deadline, counted from when it starts."""
+
+    @staticmethod
+    def _tokens(n):
+        return [
+            {'address': f"0x{i + 1:040x}", 'symbol': f"T{i}", 'decimals': 18, 'amount': 10 ** 18}
+            for i in range(n)
+        ]
+
+    def test_stalled_quote_becomes_error_row(self, monkeypatch):
+        monkeypatch.setattr(swap_preview, "_QUOTE_TIMEOUT_SEC", 0.3)
+        tokens = self._tokens(3)
+        stalled = tokens[1]['address']
+        swapper = _make_swapper()
+        fast = swapper.get_kyber_quote.side_effect
+
+        def kyber_quote(token, *args, **kwargs):
+            if token == stalled:
+                time.sleep(1.5)
+            return fast(token, *args, **kwargs)
+
+        swapper.get_kyber_quote.side_effect = kyber_quote
+        t0 = time.monotonic()
+        quotes = _run_worker(tokens, swapper, swap_mode="kyber")
+
+        assert time.monotonic() - t0 < 1.0
+        assert quotes[0]['status'] == 'ok'
+        assert quotes[1] == {'status': 'error', 'reason': 'timeout'}
+        assert quotes[2]['status'] == 'ok'
+
+    def test_queued_quotes_are_not_charged_for_waiting(self, monkeypatch):
+        # One thread, three 0.2 s quotes, 0.3 s per-quote cap: the batch takes
+        # longer than the cap, but no single quote does
+        monkeypatch.setattr(swap_preview, "_QUOTE_TIMEOUT_SEC", 0.3)
+        monkeypatch.setattr(swap_preview, "_MAX_QUOTE_THREADS", 1)
+        swapper = _make_swapper()
+        fast = swapper.get_kyber_quote.side_effect
+
+        def kyber_quote(*args, **kwargs):
+            time.sleep(0.2)
+            return fast(*args, **kwargs)
+
+        swapper.get_kyber_quote.side_effect = kyber_quote
+        quotes = _run_worker(self._tokens(3), swapper, swap_mode="kyber")
+
+        assert [quotes[i]['status'] for i in range(3)] == ['ok', 'ok', 'ok']
@@ -484,6 +484,7 @@ class TestBatchRPC:
         batch.multicall = mock_multicall
         batch._calls = []
         batch._decoders = []
+        batch._balance_account = None
         return batch
 
     def test_add_call(self):
@@ -505,6 +506,25 @@ class TestBatchRPC:
 
         assert batch._decoders[0] is decoder
 
+    def test_add_balance_of_calldata(self):
+        """add_balance_of кодирует balanceOf(holder); адрес без 0x — тот же holder."""
+        batch = self._make_batch()
+        holder = "0x55d398326f99059fF775485246999027B3197955"
+        token = "0x5555555555555555555555555555555555555555"
+
+        batch.add_balance_of(token, holder)
+        batch.add_balance_of(token, holder[2:])
+
+        expected = bytes.fromhex("70a08231") + bytes(12) + bytes.fromhex(holder[2:])
+        assert batch._calls[0].call_data == expected
+        assert batch._calls[1].call_data == expected
+
+    def test_add_balance_of_invalid_holder(self):
+        """Невалидный адрес holder'а — ошибка, а не запрос чужого баланса."""
+        batch = self._make_batch()
+        with pytest.raises(ValueError):
+            batch.add_balance_of("0x5555555555555555555555555555555555555555", "0x1234")
+
     def test_clear(self):
         """clear очищает все вызовы."""
         batch = self._make_batch()
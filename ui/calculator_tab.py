@@ -17,7 +17,8 @@ from .widgets.price_chart import PriceChartWidget
 
 from src.math.distribution import (
     calculate_bid_ask_from_percent,
-    calculate_bid_ask_distribution
+    calculate_bid_ask_distribution,
+    ladder_stats
 )
 import math
 
@@ -334,9 +335,10 @@ class CalculatorTab(QWidget):
                     decimal_tick_offset=decimal_offset,
                 )
 
-            # Update displays
-            self.position_table.set_positions(self.positions, current_price)
-            self.price_chart.set_data(self.positions, current_price)
+            # Update displays (aggregates computed once for both widgets)
+            stats = ladder_stats(self.positions)
+            self.position_table.set_positions(self.positions, current_price, stats)
+            self.price_chart.set_data(self.positions, current_price, stats)
 
         except Exception as e:
             QMessageBox.critical(
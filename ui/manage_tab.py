@@ -17,6 +17,8 @@ from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings, QRect, QMutex, QMut
 from PyQt6.QtGui import QFont, QColor, QPainter, QBrush, QPen, QLinearGradient, QPainterPath
 
 import json
+import math
+from collections import defaultdict
 import time
 import logging
 
@@ -41,6 +43,7 @@ from src.storage.pnl_store import (
 from src.math.apr import calc_position_apr, calc_aggregate_apr
 from src.receipt_parser import (
     parse_close_receipt,
+    parse_received_amounts,
     parse_swap_receipt,
     parse_swap_volatile_sent,
     calculate_usd_value,
@@ -49,6 +52,22 @@ from ui.swap_preview_dialog import SwapPreviewDialog
 
 logger = logging.getLogger(__name__)
 
+# ERC20 decimals()/symbol() — fallback token info lookup for V4 positions
+_ERC20_INFO_ABI = [
+    {"constant": True, "inputs": [], "name": "decimals",
+     "outputs": [{"name": "", "type": "uint8"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "symbol",
+     "outputs": [{"name": "", "type": "string"}], "type": "function"},
+]
+
+# Row colors reused by _update_table_row_inner (value types, safe before QApplication)
+_COLOR_PNL_POSITIVE = QColor("#00b894")
+_COLOR_PNL_NEGATIVE = QColor("#ff6b6b")
+_COLOR_VALUE_NEUTRAL = QColor(200, 200, 200)
+_COLOR_EMPTY = QColor(128, 128, 128)
+_COLOR_IN_RANGE = QColor(76, 175, 80)
+_COLOR_OUT_OF_RANGE = QColor(255, 152, 0)
+
 
 def _resolve_v4_protocol(protocol_str: str) -> V4Protocol:
     """Convert protocol string to V4Protocol enum."""
@@ -198,12 +217,7 @@ def _load_v4_position_to_dict(
                 try:
                     tc = w3.eth.contract(
                         address=Web3.to_checksum_address(erc20_addr),
-                        abi=[
-                            {"constant": True, "inputs": [], "name": "decimals",
-                             "outputs": [{"name": "", "type": "uint8"}], "type": "function"},
-                            {"constant": True, "inputs": [], "name": "symbol",
-                             "outputs": [{"name": "", "type": "string"}], "type": "function"},
-                        ]
+                        abi=_ERC20_INFO_ABI
                     )
                     position[dec_key] = tc.functions.decimals().call()
                     position[sym_key] = tc.functions.symbol().call()
@@ -243,6 +257,71 @@ def _load_v4_position_to_dict(
     return position
 
 
+def _collected_amounts(receipts: list, wallet: str, positions: list) -> dict:
+    """Token amounts the close TX(s) sent to the wallet: {token_lower: amount_wei}."""
+    if not receipts:
+        return {}
+    tokens = set()
+    for pos in positions:
+        if pos:
+            tokens.update(t for t in (pos.get('token0'), pos.get('token1')) if t)
+    try:
+        return parse_received_amounts(receipts, wallet, tokens)
+    except Exception as e:
+        logger.debug(f"Could not parse collected amounts from receipts: {e}")
+        return {}
+
+
+def _position_active_flags(position) -> tuple:
+    """(is_active, is_v4_active) as 0/1 ints for the ManageTab button counters."""
+    if not position or position.get('liquidity', 0) <= 0:
+        return 0, 0
+    return 1, int(position.get('protocol', '').startswith('v4'))
+
+
+def _pnl_row_usd(
+    tick_lower: int, tick_upper: int, current_tick, liquidity: int,
+    dec0: int, dec1: int, raw_price: float, t0_stable: bool
+) -> float:
+    """
+    Float-only USD value of a position for the PnL summary.
+
+    Same math as calc_usd_from_liquidity, but without the Decimal round-trips
+    and LiquidityAmounts allocation — the summary is display-only and runs
+    for every loaded position on each refresh.
+    """
+    if liquidity <= 0 or raw_price <= 0 or tick_lower >= tick_upper:
+        return 0.0
+
+    if current_tick is not None:
+        sqrt_cur = 1.0001 ** (current_tick / 2)
+    else:
+        # raw_price is token1/token0 in human units for both orientations
+        sqrt_cur = math.sqrt(raw_price * (10 ** (dec1 - dec0)))
+    sqrt_lower = 1.0001 ** (tick_lower / 2)
+    sqrt_upper = 1.0001 ** (tick_upper / 2)
+
+    # Below range → 100% token0, above range → 100% token1, else split
+    if sqrt_cur <= sqrt_lower:
+        amount0 = liquidity * (sqrt_upper - sqrt_lower) / (sqrt_upper * sqrt_lower)
+        amount1 = 0.0
+    elif sqrt_cur >= sqrt_upper:
+        amount0 = 0.0
+        amount1 = liquidity * (sqrt_upper - sqrt_lower)
+    else:
+        amount0 = liquidity * (sqrt_upper - sqrt_cur) / (sqrt_upper * sqrt_cur)
+        amount1 = liquidity * (sqrt_cur - sqrt_lower)
+
+    a0 = amount0 / (10 ** dec0)
+    a1 = amount1 / (10 ** dec1)
+    if t0_stable:
+        usd = a0 + a1 / raw_price
+    else:
+        usd = a1 + a0 * raw_price
+
+    return round(usd, 4) if usd > 0 else 0.0
+
+
 class NumericTableWidgetItem(QTableWidgetItem):
     """QTableWidgetItem that sorts numerically by the value stored in UserRole."""
 
@@ -931,6 +1010,10 @@ class ClosePositionsWorker(QThread):
                 'positions_data': self.positions_data,
                 'token_ids': self.token_ids,
                 'receipts': receipts,
+                'collected_amounts': _collected_amounts(
+                    receipts, self.provider.account.address,
+                    [self.positions_data.get(tid) for tid in self.token_ids],
+                ),
             }
 
             if all_success:
@@ -999,6 +1082,7 @@ class BatchCloseWorker(QThread):
                 'initial_investment': self.initial_investment,
                 'positions': self.positions,
                 'receipts': receipts,
+                'collected_amounts': _collected_amounts(receipts, wallet, self.positions),
             }
 
             if success:
@@ -1265,33 +1349,35 @@ class SwapWorker(QThread):
 class BalanceFetchWorker(QThread):
     """Worker thread for fetching ERC20 balances (avoids blocking UI)."""
 
-    result = pyqtSignal(list)  # tokens list with amounts filled in
+    result = pyqtSignal(list)  # tokens with a non-zero balance, amounts filled in
     error = pyqtSignal(str)
 
-    def __init__(self, w3, wallet: str, tokens: list):
+    def __init__(self, w3, wallet: str, tokens: list, collected_amounts: dict = None):
         super().__init__()
         self.w3 = w3
         self.wallet = wallet
         self.tokens = tokens  # list of {'address', 'symbol', 'decimals', 'amount'}
+        # {token_lower: amount_wei} received from the close TX — fallback only
+        self.collected_amounts = collected_amounts or {}
 
     def run(self):
         try:
-            erc20_abi = [
-                {"constant": True, "inputs": [{"name": "account", "type": "address"}],
-                 "name": "balanceOf", "outputs": [{"name": "", "type": "uint256"}], "type": "function"}
-            ]
+            from src.utils import BatchRPC
+            # One Multicall3 aggregate3 eth_call for all tokens instead of N balanceOf RPCs
+            batch = BatchRPC(self.w3)
             for token in self.tokens:
-                try:
-                    contract = self.w3.eth.contract(
-                        address=Web3.to_checksum_address(token['address']), abi=erc20_abi
+                batch.add_balance_of(token['address'], self.wallet)
+            balances = batch.execute()
+            for token, balance in zip(self.tokens, balances):
+                if balance is None:
+                    # Wallet balance unknown — sell at least what the close returned
+                    balance = self.collected_amounts.get(token['address'].lower(), 0)
+                    logger.warning(
+                        f"Failed to get balance for {token['symbol']}, "
+                        f"using amount from close receipt: {balance}"
                     )
-                    token['amount'] = contract.functions.balanceOf(
-                        Web3.to_checksum_address(self.wallet)
-                    ).call()
-                except Exception as e:
-                    logger.warning(f"Failed to get balance for {token['symbol']}: {e}")
-                    token['amount'] = 0
-            self.result.emit(self.tokens)
+                token['amount'] = balance
+            self.result.emit([t for t in self.tokens if t['amount'] > 0])
         except Exception as e:
             logger.error(f"BalanceFetchWorker error: {e}", exc_info=True)
             self.error.emit(str(e))
@@ -1320,10 +1406,15 @@ class ManageTab(QWidget):
         self.provider = None
         self.pool_factory = None
         self.positions_data = {}  # token_id -> position data
+        # Active / V4-active position counts, maintained by _set_position/_del_position
+        self._active_count = 0
+        self._v4_active_count = 0
         self._positions_mutex = QMutex()  # Protects positions_data access
         self.worker = None
         self._collect_worker = None
         self._balance_fetch_worker = None
+        self._pending_swap_ctx = {}  # auto-sell settings captured at close time
+        self._pending_output_token = None  # output token resolved for the swap preview
         self.load_workers = []  # Legacy compat — now means _active_workers
         self.scan_worker = None
         self._worker_queue = []  # [(token_id, protocol)] pending work
@@ -1699,7 +1790,7 @@ class ManageTab(QWidget):
         """
         # Add to input field
         current_text = self.token_ids_input.text().strip()
-        new_ids_str = ", ".join(str(tid) for tid in token_ids)
+        new_ids_str = ", ".join(map(str, token_ids))
 
         if current_text:
             self.token_ids_input.setText(f"{current_text}, {new_ids_str}")
@@ -1714,7 +1805,7 @@ class ManageTab(QWidget):
         with QMutexLocker(self._positions_mutex):
             for token_id in token_ids:
                 if token_id not in self.positions_data:
-                    self.positions_data[token_id] = None  # Placeholder
+                    self._set_position(token_id, None)  # Placeholder
                 # Store invested_usd mapping for later persistence
                 if not hasattr(self, '_invested_usd_map'):
                     self._invested_usd_map = {}
@@ -1890,14 +1981,14 @@ class ManageTab(QWidget):
             positions_protocols = json.loads(saved_protocols)
 
             if token_ids:
-                self.token_ids_input.setText(", ".join(str(tid) for tid in token_ids))
+                self.token_ids_input.setText(", ".join(map(str, token_ids)))
                 for token_id in token_ids:
                     # Initialize with protocol info if available
                     protocol = positions_protocols.get(str(token_id), None)
                     if protocol:
-                        self.positions_data[token_id] = {'protocol': protocol}
+                        self._set_position(token_id, {'protocol': protocol})
                     else:
-                        self.positions_data[token_id] = None
+                        self._set_position(token_id, None)
                 self._log(f"Loaded {len(token_ids)} saved position IDs")
         except Exception as e:
             self._log(f"Error loading saved positions: {e}")
@@ -2074,7 +2165,7 @@ class ManageTab(QWidget):
         try:
             logger.debug(f"_on_position_loaded: token_id={token_id}")
             with QMutexLocker(self._positions_mutex):
-                self.positions_data[token_id] = position
+                self._set_position(token_id, position)
             # Queue for batch table update instead of immediate update
             self._pending_updates[token_id] = position
             if not self._update_timer.isActive():
@@ -2098,8 +2189,10 @@ class ManageTab(QWidget):
         except Exception:
             self._open_positions_cache = {}
 
-        # Disable sorting ONCE for the entire batch
+        # Disable sorting, repaints and signals ONCE for the entire batch
         self.positions_table.setSortingEnabled(False)
+        self.positions_table.setUpdatesEnabled(False)
+        self.positions_table.blockSignals(True)
         try:
             for token_id, position in updates.items():
                 try:
@@ -2107,6 +2200,8 @@ class ManageTab(QWidget):
                 except Exception as e:
                     logger.error(f"Error updating table row for {token_id}: {e}", exc_info=True)
         finally:
+            self.positions_table.blockSignals(False)
+            self.positions_table.setUpdatesEnabled(True)
             self.positions_table.setSortingEnabled(True)
             self._open_positions_cache = None
         self._update_buttons()
@@ -2116,8 +2211,7 @@ class ManageTab(QWidget):
         self._log(f"❌ Position {token_id}: {error}")
         # Remove from positions if it doesn't exist
         with QMutexLocker(self._positions_mutex):
-            if token_id in self.positions_data:
-                del self.positions_data[token_id]
+            self._del_position(token_id)
         # Update input field to remove invalid IDs
         self._update_token_ids_input()
 
@@ -2144,8 +2238,7 @@ class ManageTab(QWidget):
 
         # Remove from positions
         with QMutexLocker(self._positions_mutex):
-            if token_id in self.positions_data:
-                del self.positions_data[token_id]
+            self._del_position(token_id)
         # Update input field
         self._update_token_ids_input()
 
@@ -2153,7 +2246,7 @@ class ManageTab(QWidget):
         """Update token IDs input field to reflect current positions."""
         with QMutexLocker(self._positions_mutex):
             remaining_ids = list(self.positions_data.keys())
-        self.token_ids_input.setText(", ".join(str(tid) for tid in remaining_ids))
+        self.token_ids_input.setText(", ".join(map(str, remaining_ids)))
 
     def _scan_wallet(self):
         """Scan wallet for all positions."""
@@ -2193,7 +2286,7 @@ class ManageTab(QWidget):
         self.positions_table.setRowCount(0)
         self._row_index.clear()
         with QMutexLocker(self._positions_mutex):
-            self.positions_data = {}
+            self._clear_positions()
         self.token_ids_input.clear()
 
         # Stop previous scan if still running
@@ -2238,7 +2331,7 @@ class ManageTab(QWidget):
             self._log(f"  Found #{token_id}: liquidity={liquidity:,}")
 
             with QMutexLocker(self._positions_mutex):
-                self.positions_data[token_id] = position
+                self._set_position(token_id, position)
 
             # Only show in table if not filtering or has liquidity
             if not self.hide_empty_cb.isChecked() or liquidity > 0:
@@ -2259,11 +2352,13 @@ class ManageTab(QWidget):
         shown_count = 0
         hidden_count = 0
 
-        # Batch all updates: disable sorting once
+        # Batch all updates: disable sorting, repaints and signals once
         # Take snapshot under mutex to avoid RuntimeError: dictionary changed size during iteration
         with QMutexLocker(self._positions_mutex):
             positions_snapshot = list(self.positions_data.items())
         self.positions_table.setSortingEnabled(False)
+        self.positions_table.setUpdatesEnabled(False)
+        self.positions_table.blockSignals(True)
         try:
             for token_id, position in positions_snapshot:
                 if position:
@@ -2282,6 +2377,8 @@ class ManageTab(QWidget):
                     except Exception as e:
                         logger.error(f"Error rebuilding row for {token_id}: {e}", exc_info=True)
         finally:
+            self.positions_table.blockSignals(False)
+            self.positions_table.setUpdatesEnabled(True)
             self.positions_table.setSortingEnabled(True)
 
         if hidden_count > 0:
@@ -2300,7 +2397,7 @@ class ManageTab(QWidget):
         self.refresh_btn.setEnabled(True)
 
         # Update input field with found token IDs
-        self.token_ids_input.setText(", ".join(str(tid) for tid in token_ids))
+        self.token_ids_input.setText(", ".join(map(str, token_ids)))
 
         if protocol == "v4_pancake":
             protocol_name = "PancakeSwap V4"
@@ -2316,7 +2413,7 @@ class ManageTab(QWidget):
             # Pre-register IDs with protocol placeholder so they appear in table
             with QMutexLocker(self._positions_mutex):
                 for tid in token_ids:
-                    self.positions_data[tid] = {'protocol': protocol}
+                    self._set_position(tid, {'protocol': protocol})
 
             # Load positions in parallel using existing worker pipeline
             # _on_worker_finished will call _save_positions when all workers complete
@@ -2370,6 +2467,8 @@ class ManageTab(QWidget):
         before removing, and fall back to O(n) scan if needed.
         """
         self.positions_table.setSortingEnabled(False)
+        self.positions_table.setUpdatesEnabled(False)
+        self.positions_table.blockSignals(True)
         try:
             for tid in token_ids:
                 row = self._row_index.pop(tid, -1)
@@ -2406,6 +2505,8 @@ class ManageTab(QWidget):
                     self._row_index = {k: (v if v < row else v - 1)
                                        for k, v in self._row_index.items()}
         finally:
+            self.positions_table.blockSignals(False)
+            self.positions_table.setUpdatesEnabled(True)
             self.positions_table.setSortingEnabled(True)
 
     def _auto_remove_closed_positions(self):
@@ -2426,7 +2527,7 @@ class ManageTab(QWidget):
                 if not closed_ids:
                     return
                 for tid in closed_ids:
-                    self.positions_data.pop(tid, None)
+                    self._del_position(tid)
 
             # Remove from table
             self._remove_rows_by_token_ids(closed_ids)
@@ -2435,7 +2536,7 @@ class ManageTab(QWidget):
             current_ids = self._parse_token_ids()
             closed_set = set(closed_ids)
             remaining_ids = [tid for tid in current_ids if tid not in closed_set]
-            self.token_ids_input.setText(", ".join(str(tid) for tid in remaining_ids))
+            self.token_ids_input.setText(", ".join(map(str, remaining_ids)))
 
             # Clean up persistent storage and tracking maps
             remove_open_positions(closed_ids)
@@ -2456,6 +2557,32 @@ class ManageTab(QWidget):
         finally:
             self.positions_table.setSortingEnabled(True)
 
+    def _set_row_item(self, row: int, col: int, text: str, sort_value: float = None,
+                      foreground: QColor = None) -> QTableWidgetItem:
+        """Set a cell, reusing the existing item instead of allocating a new one.
+
+        Refreshing a known position rewrites every cell of its row; updating in
+        place avoids a QTableWidgetItem allocation per cell and skips the
+        dataChanged round-trip when the text is unchanged. Numeric cells
+        (sort_value given) use NumericTableWidgetItem.
+        """
+        item = self.positions_table.item(row, col)
+        numeric = sort_value is not None
+        if item is None or isinstance(item, NumericTableWidgetItem) != numeric:
+            if numeric:
+                item = NumericTableWidgetItem(text, sort_value)
+            else:
+                item = QTableWidgetItem(text)
+            self.positions_table.setItem(row, col, item)
+        else:
+            if item.text() != text:
+                item.setText(text)
+            if numeric and item.data(Qt.ItemDataRole.UserRole) != sort_value:
+                item.setData(Qt.ItemDataRole.UserRole, sort_value)
+        # None clears a color left over from a previous update of this cell
+        item.setData(Qt.ItemDataRole.ForegroundRole, foreground)
+        return item
+
     def _update_table_row_inner(self, token_id: int, position: dict):
         """Inner implementation of table row update."""
         # O(1) row lookup via index, fallback to O(n) scan if index stale
@@ -2502,8 +2629,7 @@ class ManageTab(QWidget):
         # Check if it's a V4 protocol (either "v4" or "v4_pancake")
         is_v4 = protocol and protocol.startswith("v4")
         protocol_prefix = "V4" if is_v4 else "V3"
-        token_id_item = NumericTableWidgetItem(f"{protocol_prefix}:{token_id}", float(token_id))
-        self.positions_table.setItem(row, 0, token_id_item)
+        self._set_row_item(row, 0, f"{protocol_prefix}:{token_id}", float(token_id))
 
         # Detect if token0 is a stablecoin (need to invert prices)
         token0_addr = position.get('token0', '')
@@ -2529,12 +2655,12 @@ class ManageTab(QWidget):
             pair_str = f"{token1_sym}/{token0_sym}"
         else:
             pair_str = f"{token0_sym}/{token1_sym}"
-        self.positions_table.setItem(row, 1, QTableWidgetItem(pair_str))
+        self._set_row_item(row, 1, pair_str)
 
         # Fee
         fee = position.get('fee', 0)
         fee_pct = fee / 10000 if fee else 0
-        self.positions_table.setItem(row, 2, QTableWidgetItem(f"{fee_pct}%"))
+        self._set_row_item(row, 2, f"{fee_pct}%")
 
         # Price Range (convert ticks to prices)
         tick_lower = position.get('tick_lower', 0)
@@ -2630,7 +2756,7 @@ class ManageTab(QWidget):
             price_range_str = f"${price_lower:.2f} - ${price_upper:.2f}"
         else:
             price_range_str = f"${price_lower:,.0f} - ${price_upper:,.0f}"
-        self.positions_table.setItem(row, 3, QTableWidgetItem(price_range_str))
+        self._set_row_item(row, 3, price_range_str)
 
         # Liquidity — convert raw L to USD value
         liquidity = position.get('liquidity', 0)
@@ -2698,8 +2824,7 @@ class ManageTab(QWidget):
             else:
                 liq_str = f"{liquidity:,.0f}"
 
-        liq_item = NumericTableWidgetItem(liq_str, usd_value)
-        self.positions_table.setItem(row, 4, liq_item)
+        self._set_row_item(row, 4, liq_str, usd_value)
 
         # Fees Earned (tokens_owed)
         fees0 = position.get('tokens_owed0', 0)
@@ -2717,8 +2842,7 @@ class ManageTab(QWidget):
         else:
             fees_str = f"{fees0_formatted:.6f} / {fees1_formatted:.4f}"
             total_fees_usd = fees1_formatted + (fees0_formatted * raw_price if raw_price > 0 else 0)
-        fees_item = NumericTableWidgetItem(fees_str, total_fees_usd)
-        self.positions_table.setItem(row, 5, fees_item)
+        self._set_row_item(row, 5, fees_str, total_fees_usd)
 
         # PnL = (current value + fees) - invested
         invested = 0.0
@@ -2738,31 +2862,29 @@ class ManageTab(QWidget):
                     pnl_str = f"{sign}${pnl:.2f} ({sign}{pnl_pct:.0f}%)"
                 else:
                     pnl_str = f"{sign}${pnl:.2f}"
-                pnl_item = NumericTableWidgetItem(pnl_str, pnl)
-                pnl_item.setForeground(QColor("#00b894") if pnl >= 0 else QColor("#ff6b6b"))
+                self._set_row_item(
+                    row, 6, pnl_str, pnl,
+                    _COLOR_PNL_POSITIVE if pnl >= 0 else _COLOR_PNL_NEGATIVE,
+                )
             else:
-                pnl_item = NumericTableWidgetItem(f"${total_pos_value:.2f}", total_pos_value)
-                pnl_item.setForeground(QColor(200, 200, 200))
+                self._set_row_item(row, 6, f"${total_pos_value:.2f}", total_pos_value, _COLOR_VALUE_NEUTRAL)
         else:
-            pnl_item = NumericTableWidgetItem("—", 0.0)
-        self.positions_table.setItem(row, 6, pnl_item)
+            self._set_row_item(row, 6, "—", 0.0)
 
         # Status (current_tick already fetched above for liquidity calc)
         in_range = tick_lower <= current_tick <= tick_upper if current_tick is not None else False
 
         if liquidity == 0:
             status = "Empty"
-            status_color = QColor(128, 128, 128)
+            status_color = _COLOR_EMPTY
         elif in_range:
             status = "In Range"
-            status_color = QColor(76, 175, 80)
+            status_color = _COLOR_IN_RANGE
         else:
             status = "Out of Range"
-            status_color = QColor(255, 152, 0)
+            status_color = _COLOR_OUT_OF_RANGE
 
-        status_item = QTableWidgetItem(status)
-        status_item.setForeground(status_color)
-        self.positions_table.setItem(row, 7, status_item)
+        self._set_row_item(row, 7, status, foreground=status_color)
 
         # Range Progress (with custom delegate)
         # Only set valid data if prices are valid
@@ -2792,14 +2914,16 @@ class ManageTab(QWidget):
             display_price_upper = None
             display_current = None
 
-        progress_item = QTableWidgetItem()
+        progress_item = self.positions_table.item(row, 8)
+        if progress_item is None:
+            progress_item = QTableWidgetItem()
+            self.positions_table.setItem(row, 8, progress_item)
         progress_item.setData(Qt.ItemDataRole.UserRole, {
             'price_lower': display_price_lower,
             'price_upper': display_price_upper,
             'current_price': display_current,
             'in_range': in_range if is_price_valid else False
         })
-        self.positions_table.setItem(row, 8, progress_item)
 
         # Set row height for progress bar
         self.positions_table.setRowHeight(row, 44)
@@ -2820,21 +2944,13 @@ class ManageTab(QWidget):
 
         # Group positions by their stored protocol
         # This ensures V4 Uniswap, V4 PancakeSwap, V3, etc. are loaded with correct managers
-        positions_by_protocol = {}
+        # No stored protocol → use combo box selection (read once, not per token)
+        default_protocol = self.scan_protocol_combo.currentData() or "v3"
+        positions_by_protocol = defaultdict(list)
         for token_id in token_ids:
             pos = snapshot.get(token_id)
-            if pos and isinstance(pos, dict):
-                stored_protocol = pos.get('protocol', None)
-            else:
-                stored_protocol = None
-
-            if stored_protocol is None:
-                # No stored protocol - use combo box selection
-                stored_protocol = self.scan_protocol_combo.currentData() or "v3"
-
-            if stored_protocol not in positions_by_protocol:
-                positions_by_protocol[stored_protocol] = []
-            positions_by_protocol[stored_protocol].append(token_id)
+            stored_protocol = pos.get('protocol') if isinstance(pos, dict) else None
+            positions_by_protocol[stored_protocol or default_protocol].append(token_id)
 
         # Cancel existing workers ONCE before creating new ones
         self._cancel_load_workers()
@@ -2894,19 +3010,15 @@ class ManageTab(QWidget):
             token1_is_stable = token1 in STABLECOINS
 
             pos_usd = 0.0
+            raw_price = position.get('current_price', 0) or 0
             try:
-                raw_price = position.get('current_price', 0)
-                if raw_price and raw_price > 0 and tick_lower < tick_upper:
-                    human_price = (1 / raw_price) if token0_is_stable else raw_price
-                    usd = calc_usd_from_liquidity(
-                        tick_lower, tick_upper, liquidity, human_price,
-                        token0, token1, dec0, dec1, cur_tick=current_tick,
-                    )
-                    if usd:
-                        pos_usd = usd
-                        total_value += usd
+                pos_usd = _pnl_row_usd(
+                    tick_lower, tick_upper, current_tick, liquidity,
+                    dec0, dec1, raw_price, token0_is_stable,
+                )
+                total_value += pos_usd
             except Exception:
-                pass
+                pos_usd = 0.0
 
             # Fees (USD estimate from both sides)
             fees0 = position.get('tokens_owed0', 0)
@@ -2962,48 +3074,70 @@ class ManageTab(QWidget):
                 )
             except Exception:
                 pass
-        parts = [f"Positions: {active_count}", f"Value: ${total_value:.2f}"]
-        if total_fees > 0:
-            parts.append(f"Fees: ${total_fees:.4f}")
-        if claimed_fees_total > 0:
-            parts.append(f"Claimed: ${claimed_fees_total:.2f}")
-
         # Aggregate APR
         agg_apr = calc_aggregate_apr(apr_map, value_map)
-        if agg_apr is not None:
-            parts.append(f"APR: {agg_apr:.1f}%/day")
 
+        pnl_segment = ""
         if initial > 0:
             pnl = total_value + total_fees + claimed_fees_total - initial
             pnl_sign = "+" if pnl >= 0 else ""
-            pnl_pct = (pnl / initial * 100) if initial > 0 else 0
-            parts.append(f"PnL: {pnl_sign}${pnl:.2f} ({pnl_sign}{pnl_pct:.1f}%)")
+            pnl_pct = pnl / initial * 100
+            pnl_segment = f" | PnL: {pnl_sign}${pnl:.2f} ({pnl_sign}{pnl_pct:.1f}%)"
             color = "#00b894" if pnl >= 0 else "#ff6b6b"
             self.pnl_summary_label.setStyleSheet(f"color: {color}; font-size: 12px; padding: 4px 8px;")
         else:
             self.pnl_summary_label.setStyleSheet("color: #aaa; font-size: 12px; padding: 4px 8px;")
 
-        self.pnl_summary_label.setText(" | ".join(parts))
+        self.pnl_summary_label.setText(
+            f"Positions: {active_count} | Value: ${total_value:.2f}"
+            + (f" | Fees: ${total_fees:.4f}" if total_fees > 0 else "")
+            + (f" | Claimed: ${claimed_fees_total:.2f}" if claimed_fees_total > 0 else "")
+            + (f" | APR: {agg_apr:.1f}%/day" if agg_apr is not None else "")
+            + pnl_segment
+        )
 
         # Store APR data for dashboard
         self._apr_map = apr_map
         self._value_map = value_map
 
+    def _set_position(self, token_id: int, position):
+        """Store a position and keep the active counters in sync.
+
+        Caller must hold _positions_mutex.
+        """
+        old_active, old_v4 = _position_active_flags(self.positions_data.get(token_id))
+        new_active, new_v4 = _position_active_flags(position)
+        self._active_count += new_active - old_active
+        self._v4_active_count += new_v4 - old_v4
+        self.positions_data[token_id] = position
+
+    def _del_position(self, token_id: int):
+        """Remove a position (if present) and keep the active counters in sync.
+
+        Caller must hold _positions_mutex.
+        """
+        if token_id not in self.positions_data:
+            return
+        active, v4 = _position_active_flags(self.positions_data.pop(token_id))
+        self._active_count -= active
+        self._v4_active_count -= v4
+
+    def _clear_positions(self):
+        """Drop all positions and reset the active counters.
+
+        Caller must hold _positions_mutex.
+        """
+        self.positions_data = {}
+        self._active_count = 0
+        self._v4_active_count = 0
+
     def _update_buttons(self):
         """Update button states based on positions."""
+        # Counters are kept in sync by _set_position/_del_position — O(1) here
         with QMutexLocker(self._positions_mutex):
-            pos_values = list(self.positions_data.values())
-        has_positions = len(pos_values) > 0
-        has_active = any(
-            p and p.get('liquidity', 0) > 0
-            for p in pos_values
-        )
-
-        # Count V4 positions with liquidity for batch close
-        v4_active_count = sum(
-            1 for p in pos_values
-            if p and p.get('protocol', '').startswith('v4') and p.get('liquidity', 0) > 0
-        )
+            has_positions = len(self.positions_data) > 0
+            has_active = self._active_count > 0
+            v4_active_count = self._v4_active_count
 
         self.close_selected_btn.setEnabled(has_active)
         self.close_all_btn.setEnabled(has_active)
@@ -3013,14 +3147,18 @@ class ManageTab(QWidget):
 
         # Enable collect fees when any positions are loaded
         # (V4 tokens_owed may be 0 in UI but fees exist on-chain)
-        self.collect_fees_btn.setEnabled(len(pos_values) > 0)
+        self.collect_fees_btn.setEnabled(has_positions)
 
     def _get_selected_token_ids(self) -> list:
         """Get token IDs of selected rows."""
-        selected_rows = set(item.row() for item in self.positions_table.selectedItems())
+        positions_table = self.positions_table
+        # Table uses SelectRows, so selectedRows() yields one index per row
+        # (selectedItems() would return every selected cell)
+        selected_rows = [idx.row() for idx in positions_table.selectionModel().selectedRows()]
+        item_at = positions_table.item
         result = []
         for row in selected_rows:
-            item = self.positions_table.item(row, 0)
+            item = item_at(row, 0)
             if item:
                 # Try to get from UserRole first (raw token_id, stored as float)
                 raw_id = item.data(Qt.ItemDataRole.UserRole)
@@ -3045,20 +3183,14 @@ class ManageTab(QWidget):
 
         with QMutexLocker(self._positions_mutex):
             for token_id in token_ids:
-                if token_id in self.positions_data:
-                    del self.positions_data[token_id]
-            snapshot = dict(self.positions_data)
+                self._del_position(token_id)
+            remaining_ids = list(self.positions_data.keys())
 
         # Update input field
-        remaining_ids = list(snapshot.keys())
-        self.token_ids_input.setText(", ".join(str(tid) for tid in remaining_ids))
+        self.token_ids_input.setText(", ".join(map(str, remaining_ids)))
 
-        # Rebuild table
-        self.positions_table.setRowCount(0)
-        self._row_index.clear()
-        for token_id, position in snapshot.items():
-            if position:
-                self._update_table_row(token_id, position)
+        # Drop only the removed rows — the rest of the table is unchanged
+        self._remove_rows_by_token_ids(token_ids)
 
         self._save_positions()
         self._update_buttons()
@@ -3099,32 +3231,59 @@ class ManageTab(QWidget):
 
         self._close_positions(token_ids)
 
+    def _collect_swap_ctx(self, auto_sell: bool, swap_slippage: float) -> dict:
+        """Snapshot auto-sell settings for the preview/swap step after close.
+
+        The private key is only looked up when auto-sell is enabled.
+        """
+        private_key = None
+        if auto_sell:
+            try:
+                main_window = self.window()
+                if hasattr(main_window, 'create_tab') and hasattr(main_window.create_tab, 'private_key'):
+                    private_key = main_window.create_tab.private_key
+                elif hasattr(self.provider, 'account') and hasattr(self.provider.account, 'key'):
+                    private_key = self.provider.account.key.hex()
+            except Exception:
+                pass
+        return {
+            'auto_sell': auto_sell,
+            'slippage': swap_slippage,
+            'max_impact': self.max_impact_spin.value(),
+            'swap_mode': self.swap_mode_combo.currentData() or "auto",
+            'private_key': private_key,
+        }
+
     def _batch_close_all(self):
         """Close ALL V4 positions in ONE transaction (gas efficient)."""
         if not self.provider:
             QMessageBox.warning(self, "Error", "Provider not connected.")
             return
 
-        # Get all V4 positions with liquidity
+        # Single pass: collect V4 positions with liquidity, their token IDs,
+        # and any with missing/null token addresses
+        null_addr = "0x0000000000000000000000000000000000000000"
+        v4_positions = []
+        token_ids = []
+        invalid_positions = []
         with QMutexLocker(self._positions_mutex):
             pos_values = list(self.positions_data.values())
-        v4_positions = [
-            p for p in pos_values
-            if p and p.get('protocol', '').startswith('v4') and p.get('liquidity', 0) > 0
-        ]
+        for p in pos_values:
+            if not p:
+                continue
+            if not p.get('protocol', '').startswith('v4') or p.get('liquidity', 0) <= 0:
+                continue
+            v4_positions.append(p)
+            token_ids.append(p['token_id'])
+            t0 = p.get('token0')
+            t1 = p.get('token1')
+            if not t0 or not t1 or t0 == null_addr or t1 == null_addr:
+                invalid_positions.append(p)
 
         if not v4_positions:
             QMessageBox.warning(self, "Error", "No active V4 positions to close.")
             return
 
-        # Check for null addresses
-        null_addr = "0x0000000000000000000000000000000000000000"
-        invalid_positions = [
-            p for p in v4_positions
-            if not p.get('token0') or not p.get('token1')
-            or p.get('token0') == null_addr or p.get('token1') == null_addr
-        ]
-
         if invalid_positions:
             QMessageBox.warning(
                 self, "Error",
@@ -3139,7 +3298,6 @@ class ManageTab(QWidget):
         initial_investment = self.initial_investment_spin.value()
 
         # Show confirmation
-        token_ids = [p['token_id'] for p in v4_positions]
         confirm_msg = (
             f"Close {len(v4_positions)} V4 position(s) in ONE transaction?\n\n"
             f"Token IDs: {token_ids}\n\n"
@@ -3160,29 +3318,15 @@ class ManageTab(QWidget):
             return
 
         # Save swap settings for preview/swap step
-        self._pending_auto_sell = auto_sell
-        self._pending_swap_slippage = swap_slippage
-        self._pending_max_price_impact = self.max_impact_spin.value()
-        self._pending_swap_mode = self.swap_mode_combo.currentData() or "auto"
-        self._pending_private_key = None
+        self._pending_swap_ctx = self._collect_swap_ctx(auto_sell, swap_slippage)
 
-        if auto_sell:
-            try:
-                main_window = self.window()
-                if hasattr(main_window, 'create_tab') and hasattr(main_window.create_tab, 'private_key'):
-                    self._pending_private_key = main_window.create_tab.private_key
-                elif hasattr(self.provider, 'account') and hasattr(self.provider.account, 'key'):
-                    self._pending_private_key = self.provider.account.key.hex()
-            except Exception:
-                pass
-
-            if not self._pending_private_key:
-                QMessageBox.warning(
-                    self, "Auto-sell Error",
-                    "Could not get private key for auto-sell.\n"
-                    "Please ensure wallet is connected in Create tab."
-                )
-                return
+        if auto_sell and not self._pending_swap_ctx['private_key']:
+            QMessageBox.warning(
+                self, "Auto-sell Error",
+                "Could not get private key for auto-sell.\n"
+                "Please ensure wallet is connected in Create tab."
+            )
+            return
 
         # Start batch close worker
         self.progress_bar.show()
@@ -3220,7 +3364,7 @@ class ManageTab(QWidget):
                 self._log(f"TX Hash: {data.get('tx_hash', 'N/A')}")
 
                 # Check if auto-sell with preview is pending
-                if getattr(self, '_pending_auto_sell', False) and self._pending_private_key:
+                if self._pending_swap_ctx.get('auto_sell') and self._pending_swap_ctx.get('private_key'):
                     # Defer trade recording until swap completes
                     self._deferred_trade_data = data
                     self._log("Preparing swap preview...")
@@ -3415,29 +3559,15 @@ class ManageTab(QWidget):
             return
 
         # Save swap settings for preview/swap step
-        self._pending_auto_sell = auto_sell
-        self._pending_swap_slippage = swap_slippage
-        self._pending_max_price_impact = self.max_impact_spin.value()
-        self._pending_swap_mode = self.swap_mode_combo.currentData() or "auto"
-        self._pending_private_key = None
+        self._pending_swap_ctx = self._collect_swap_ctx(auto_sell, swap_slippage)
 
-        if auto_sell:
-            try:
-                main_window = self.window()
-                if hasattr(main_window, 'create_tab') and hasattr(main_window.create_tab, 'private_key'):
-                    self._pending_private_key = main_window.create_tab.private_key
-                elif hasattr(self.provider, 'account') and hasattr(self.provider.account, 'key'):
-                    self._pending_private_key = self.provider.account.key.hex()
-            except Exception:
-                pass
-
-            if not self._pending_private_key:
-                QMessageBox.warning(
-                    self, "Auto-sell Error",
-                    "Could not get private key for auto-sell.\n"
-                    "Please ensure wallet is connected in Create tab."
-                )
-                return
+        if auto_sell and not self._pending_swap_ctx['private_key']:
+            QMessageBox.warning(
+                self, "Auto-sell Error",
+                "Could not get private key for auto-sell.\n"
+                "Please ensure wallet is connected in Create tab."
+            )
+            return
 
         # Get chain ID
         chain_id = getattr(self.provider, 'chain_id', 56)
@@ -3579,12 +3709,12 @@ class ManageTab(QWidget):
             if closed_ids:
                 with QMutexLocker(self._positions_mutex):
                     for tid in closed_ids:
-                        self.positions_data.pop(tid, None)
+                        self._del_position(tid)
                 # Remove closed IDs from input field so they don't reload
                 closed_set = set(closed_ids)
                 current_ids = self._parse_token_ids()
                 remaining_ids = [tid for tid in current_ids if tid not in closed_set]
-                self.token_ids_input.setText(", ".join(str(tid) for tid in remaining_ids))
+                self.token_ids_input.setText(", ".join(map(str, remaining_ids)))
                 # Remove closed rows from table
                 self._remove_rows_by_token_ids(closed_ids)
             # Update invested spinbox with remaining positions
@@ -3852,7 +3982,7 @@ class ManageTab(QWidget):
                 self._log(f"TX Hash: {data.get('tx_hash', 'N/A')}")
 
                 # Check if auto-sell with preview is pending
-                if getattr(self, '_pending_auto_sell', False) and self._pending_private_key:
+                if self._pending_swap_ctx.get('auto_sell') and self._pending_swap_ctx.get('private_key'):
                     # Defer trade recording until swap completes
                     self._deferred_trade_data = data
                     self._log("Preparing swap preview...")
@@ -3881,48 +4011,39 @@ class ManageTab(QWidget):
             token_ids = close_data.get('token_ids', [])
             positions = close_data.get('positions', [])
 
-            tokens_to_sell = []
-            seen = set()
-
-            # From ClosePositionsWorker (has positions_data + token_ids)
+            # ClosePositionsWorker sends positions_data + token_ids,
+            # BatchCloseWorker sends a positions list — walk both in one pass.
             # Include stablecoins too — SwapWorker skips them but counts their USD
-            if positions_data and token_ids:
-                for tid in token_ids:
-                    pos = positions_data.get(tid, {})
-                    if not pos:
-                        continue
-                    for key, dec_key, sym_key in [
-                        ('token0', 'token0_decimals', 'token0_symbol'),
-                        ('token1', 'token1_decimals', 'token1_symbol'),
-                    ]:
-                        addr = pos.get(key, '')
-                        if not addr or addr.lower() in seen:
-                            continue
-                        seen.add(addr.lower())
-                        tokens_to_sell.append({
-                            'address': addr,
-                            'decimals': pos.get(dec_key, 18),
-                            'symbol': pos.get(sym_key, 'TOKEN'),
-                            'amount': 0,
-                        })
+            all_positions = [
+                positions_data[tid] for tid in token_ids if positions_data.get(tid)
+            ] if positions_data else []
+            all_positions += positions
 
-            # From BatchCloseWorker (has positions list)
-            if positions:
-                for pos in positions:
-                    for key, dec_key, sym_key in [
-                        ('token0', 'token0_decimals', 'token0_symbol'),
-                        ('token1', 'token1_decimals', 'token1_symbol'),
-                    ]:
-                        addr = pos.get(key, '')
-                        if not addr or addr.lower() in seen:
-                            continue
-                        seen.add(addr.lower())
-                        tokens_to_sell.append({
-                            'address': addr,
-                            'decimals': pos.get(dec_key, 18),
-                            'symbol': pos.get(sym_key, 'TOKEN'),
-                            'amount': 0,
-                        })
+            tokens_to_sell = []
+            seen = set()
+            seen_add = seen.add
+            tokens_to_sell_append = tokens_to_sell.append
+            for pos in all_positions:
+                addr = pos.get('token0') or ''
+                addr_lower = addr.lower()
+                if addr and addr_lower not in seen:
+                    seen_add(addr_lower)
+                    tokens_to_sell_append({
+                        'address': addr,
+                        'decimals': pos.get('token0_decimals', 18),
+                        'symbol': pos.get('token0_symbol', 'TOKEN'),
+                        'amount': 0,
+                    })
+                addr = pos.get('token1') or ''
+                addr_lower = addr.lower()
+                if addr and addr_lower not in seen:
+                    seen_add(addr_lower)
+                    tokens_to_sell_append({
+                        'address': addr,
+                        'decimals': pos.get('token1_decimals', 18),
+                        'symbol': pos.get('token1_symbol', 'TOKEN'),
+                        'amount': 0,
+                    })
 
             if not tokens_to_sell:
                 self._log("No volatile tokens to sell (all stablecoins)")
@@ -3945,12 +4066,15 @@ class ManageTab(QWidget):
             # See _record_closed_trade for the receipt-based PnL path.
             wallet = self.provider.account.address
             self._close_data = close_data
-            self._balance_fetch_worker = BalanceFetchWorker(w3, wallet, tokens_to_sell)
+            self._balance_fetch_worker = BalanceFetchWorker(
+                w3, wallet, tokens_to_sell,
+                collected_amounts=close_data.get('collected_amounts'),
+            )
             self._balance_fetch_worker.result.connect(
                 self._on_balances_fetched, Qt.ConnectionType.QueuedConnection
             )
             self._balance_fetch_worker.error.connect(
-                lambda e: self._on_balance_fetch_error(e), Qt.ConnectionType.QueuedConnection
+                self._on_balance_fetch_error, Qt.ConnectionType.QueuedConnection
             )
             self._balance_fetch_worker.start()
 
@@ -3964,8 +4088,12 @@ class ManageTab(QWidget):
                 self._deferred_trade_data = None
             self._refresh_all_positions()
 
-    def _on_balances_fetched(self, tokens: list):
-        """Handle balance fetch completion — show swap preview or sell."""
+    def _on_balances_fetched(self, tokens_to_sell: list):
+        """Handle balance fetch completion — show swap preview or sell.
+
+        Runs on the GUI thread once BalanceFetchWorker has read the wallet
+        balances; receives only tokens with a non-zero balance.
+        """
         try:
             # Cleanup worker
             if hasattr(self, '_balance_fetch_worker') and self._balance_fetch_worker is not None:
@@ -3979,9 +4107,6 @@ class ManageTab(QWidget):
             chain_id = getattr(self.provider, 'chain_id', 56)
             w3 = self.provider.w3
 
-            # Filter out zero-balance tokens
-            tokens_to_sell = [t for t in tokens if t.get('amount', 0) > 0]
-
             if not tokens_to_sell:
                 self._log("No tokens with balance to sell")
                 # Record deferred trade since no swap will happen
@@ -3997,10 +4122,11 @@ class ManageTab(QWidget):
                 self._refresh_all_positions()
                 return
 
-            # Get output token
+            # Get output token (reused by _on_swap_confirmed)
             proxy = getattr(self.provider, 'proxy', None)
             swapper = DexSwap(w3, chain_id, use_kyber=False, proxy=proxy)
             output_token = swapper.get_output_token()
+            self._pending_output_token = output_token
 
             # Skip preview → sell immediately
             if self.skip_preview_cb.isChecked():
@@ -4009,13 +4135,14 @@ class ManageTab(QWidget):
                 return
 
             # Show preview dialog
+            swap_ctx = self._pending_swap_ctx
             dialog = SwapPreviewDialog(
                 self, tokens_to_sell, chain_id, w3,
                 output_token=output_token,
-                slippage=self._pending_swap_slippage,
-                max_price_impact=self._pending_max_price_impact,
+                slippage=swap_ctx['slippage'],
+                max_price_impact=swap_ctx['max_impact'],
                 proxy=proxy,
-                swap_mode=self._pending_swap_mode,
+                swap_mode=swap_ctx['swap_mode'],
             )
             dialog.confirmed.connect(self._on_swap_confirmed)
             result = dialog.exec()
@@ -4069,8 +4196,9 @@ class ManageTab(QWidget):
             chain_id = getattr(self.provider, 'chain_id', 56)
             w3 = self.provider.w3
             proxy = getattr(self.provider, 'proxy', None)
-            swapper = DexSwap(w3, chain_id, use_kyber=False, proxy=proxy)
-            output_token = swapper.get_output_token()
+            output_token = self._pending_output_token
+            if not output_token:
+                output_token = DexSwap(w3, chain_id, use_kyber=False, proxy=proxy).get_output_token()
 
             self.progress_bar.show()
             self.close_selected_btn.setEnabled(False)
@@ -4078,19 +4206,19 @@ class ManageTab(QWidget):
             self.batch_close_btn.setEnabled(False)
 
             initial_investment = self.initial_investment_spin.value()
-            swap_mode = getattr(self, '_pending_swap_mode', 'auto')
+            swap_ctx = self._pending_swap_ctx
 
             if getattr(self, '_swap_worker', None) is not None:
                 self._safe_cleanup_worker(self._swap_worker)
             self._swap_worker = SwapWorker(
                 w3, chain_id, tokens,
-                private_key=self._pending_private_key,
+                private_key=swap_ctx['private_key'],
                 output_token=output_token,
-                slippage=self._pending_swap_slippage,
-                max_price_impact=self._pending_max_price_impact,
+                slippage=swap_ctx['slippage'],
+                max_price_impact=swap_ctx['max_impact'],
                 initial_investment=initial_investment,
                 proxy=proxy,
-                swap_mode=swap_mode,
+                swap_mode=swap_ctx['swap_mode'],
             )
             self._swap_worker.progress.connect(self._on_progress, Qt.ConnectionType.QueuedConnection)
             self._swap_worker.swap_result.connect(self._on_swap_finished, Qt.ConnectionType.QueuedConnection)
@@ -4113,6 +4241,7 @@ class ManageTab(QWidget):
             if hasattr(self, '_swap_worker') and self._swap_worker is not None:
                 self._safe_cleanup_worker(self._swap_worker)
                 self._swap_worker = None
+            self._pending_output_token = None
             self.progress_bar.hide()
             self.close_selected_btn.setEnabled(True)
             self.close_all_btn.setEnabled(True)
@@ -4122,7 +4251,7 @@ class ManageTab(QWidget):
             tx_hash = close_data.get('tx_hash', 'N/A')
 
             wallet_swap_usd = results.get('total_usd', 0)  # raw full-wallet swap proceeds
-            swaps = results.get('swaps', [])
+            swaps = [s for s in results.get('swaps', []) if isinstance(s, dict)]
             initial = results.get('initial_investment', 0)
             swap_tx_hashes = [s.get('tx_hash') for s in swaps if s.get('tx_hash')]
             swap_tx_hash = swap_tx_hashes[0] if swap_tx_hashes else None
@@ -4180,33 +4309,6 @@ class ManageTab(QWidget):
                 pnl = None
                 pnl_percent = None
 
-            # Build dialog message — focus on what the user cares about: invested, received, PnL.
-            # Internal mechanics (full-wallet swap output, pro-rata dust) go to logger only.
-            result_msg = f"Positions closed & tokens sold!\n\nClose TX: {tx_hash}\n"
-            if swap_tx_hash:
-                result_msg += f"Swap TX:  {swap_tx_hash}\n"
-
-            # Surface failed swaps so user knows something went wrong
-            failed_swaps = [s for s in swaps if not s.get('success')]
-            if failed_swaps:
-                result_msg += "\nSwap errors:\n"
-                for s in failed_swaps:
-                    result_msg += f"  FAIL {s.get('token', '?')}: {s.get('error', 'Failed')}\n"
-
-            if initial > 0 and pnl is not None:
-                pnl_sign = "+" if pnl >= 0 else ""
-                result_msg += f"\n{'='*40}\nPnL\n{'='*40}\n"
-                result_msg += f"\n  Invested: ${initial:.2f}\n"
-                result_msg += f"  Received: ${received:.2f}\n"
-                result_msg += f"  Profit/Loss: {pnl_sign}${pnl:.2f} ({pnl_sign}{pnl_percent:.1f}%)\n"
-                if received_unknown:
-                    result_msg += "\n  (Received estimated as break-even — exact amount\n"
-                    result_msg += "   not derivable from receipts; verify on explorer.)\n"
-                self._log(f"PnL: {pnl_sign}${pnl:.2f} ({pnl_sign}{pnl_percent:.1f}%)")
-            else:
-                # No invested figure available — just show what came back from this close
-                result_msg += f"\nReceived from this close: ${received:.2f}\n"
-
             # Diagnostic breakdown — log only, not displayed to user
             if breakdown:
                 self._log(
@@ -4225,9 +4327,6 @@ class ManageTab(QWidget):
                 self._record_closed_trade(deferred)
                 self._deferred_trade_data = None
 
-            QMessageBox.information(self, "Close & Sell Complete", result_msg)
-            self._refresh_all_positions()
-
         except Exception as e:
             logger.exception(f"Error in _on_swap_finished: {e}")
             self._log(f"Error in swap handler: {e}")
@@ -4236,6 +4335,42 @@ class ManageTab(QWidget):
             if deferred:
                 self._record_closed_trade(deferred)
                 self._deferred_trade_data = None
+            return
+
+        # Build dialog message — focus on what the user cares about: invested, received, PnL.
+        # Internal mechanics (full-wallet swap output, pro-rata dust) go to logger only.
+        parts = [f"Positions closed & tokens sold!\n\nClose TX: {tx_hash}\n"]
+        if swap_tx_hash:
+            parts.append(f"Swap TX:  {swap_tx_hash}\n")
+
+        # Surface failed swaps so user knows something went wrong
+        failed_swaps = [s for s in swaps if not s.get('success')]
+        if failed_swaps:
+            parts.append("\nSwap errors:\n")
+            for s in failed_swaps:
+                parts.append(f"  FAIL {s.get('token', '?')}: {s.get('error', 'Failed')}\n")
+
+        if initial > 0 and pnl is not None:
+            pnl_sign = "+" if pnl >= 0 else ""
+            parts.append(f"\n{'='*40}\nPnL\n{'='*40}\n")
+            parts.append(f"\n  Invested: ${initial:.2f}\n")
+            parts.append(f"  Received: ${received:.2f}\n")
+            parts.append(f"  Profit/Loss: {pnl_sign}${pnl:.2f} ({pnl_sign}{pnl_percent:.1f}%)\n")
+            if received_unknown:
+                parts.append("\n  (Received estimated as break-even — exact amount\n"
+                             "   not derivable from receipts; verify on explorer.)\n")
+            self._log(f"PnL: {pnl_sign}${pnl:.2f} ({pnl_sign}{pnl_percent:.1f}%)")
+        else:
+            # No invested figure available — just show what came back from this close
+            parts.append(f"\nReceived from this close: ${received:.2f}\n")
+        result_msg = "".join(parts)
+
+        try:
+            QMessageBox.information(self, "Close & Sell Complete", result_msg)
+            self._refresh_all_positions()
+        except Exception as e:
+            logger.exception(f"Error showing swap results: {e}")
+            self._log(f"Error in swap handler: {e}")
 
     def _clear_list(self):
         """Clear the positions list."""
@@ -4251,7 +4386,7 @@ class ManageTab(QWidget):
 
         self.positions_table.setRowCount(0)
         with QMutexLocker(self._positions_mutex):
-            self.positions_data = {}
+            self._clear_positions()
         self._row_index.clear()
         self.token_ids_input.clear()
         self.close_selected_btn.setEnabled(False)
@@ -12,41 +12,56 @@ from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 
 
+def _strength_bucket(strength: int) -> int:
+    """Индекс цветовой группы для силы пароля (0-3)."""
+    if strength < 30:
+        return 0
+    if strength < 60:
+        return 1
+    if strength < 80:
+        return 2
+    return 3
+
+
+_BAR_STYLE_TEMPLATE = """
+    QProgressBar {{
+        border: 1px solid #444;
+        border-radius: 4px;
+        background: #2a2a2a;
+    }}
+    QProgressBar::chunk {{
+        background: {color};
+        border-radius: 3px;
+    }}
+"""
+
+
 class PasswordStrengthIndicator(QProgressBar):
     """Индикатор силы пароля."""
 
+    # Готовые стили по группам: красный, оранжевый, жёлто-зелёный, зелёный
+    _STYLES = tuple(
+        _BAR_STYLE_TEMPLATE.format(color=c)
+        for c in ("#ff4444", "#ffaa00", "#88cc00", "#00cc44")
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setTextVisible(False)
         self.setMaximum(100)
         self.setFixedHeight(8)
+        self._last_bucket = -1
 
     def update_strength(self, password: str):
         """Обновление индикатора на основе пароля."""
         strength = self._calculate_strength(password)
         self.setValue(strength)
 
-        # Цвет в зависимости от силы
-        if strength < 30:
-            color = "#ff4444"  # Красный
-        elif strength < 60:
-            color = "#ffaa00"  # Оранжевый
-        elif strength < 80:
-            color = "#88cc00"  # Жёлто-зелёный
-        else:
-            color = "#00cc44"  # Зелёный
-
-        self.setStyleSheet(f"""
-            QProgressBar {{
-                border: 1px solid #444;
-                border-radius: 4px;
-                background: #2a2a2a;
-            }}
-            QProgressBar::chunk {{
-                background: {color};
-                border-radius: 3px;
-            }}
-        """)
+        # Цвет в зависимости от силы — стиль меняем только при смене группы
+        bucket = _strength_bucket(strength)
+        if bucket != self._last_bucket:
+            self.setStyleSheet(self._STYLES[bucket])
+            self._last_bucket = bucket
 
     def _calculate_strength(self, password: str) -> int:
         """Расчёт силы пароля (0-100)."""
@@ -59,10 +74,21 @@ class PasswordStrengthIndicator(QProgressBar):
         score += min(len(password) * 4, 40)
 
         # Разнообразие символов
-        has_lower = any(c.islower() for c in password)
-        has_upper = any(c.isupper() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(not c.isalnum() for c in password)
+        # Один проход по строке вместо четырёх any(...)
+        has_lower = has_upper = has_digit = has_special = False
+        for c in password:
+            if c.islower():
+                has_lower = True
+            elif c.isupper():
+                has_upper = True
+            elif c.isdigit():
+                has_digit = True
+            elif not c.isalnum():
+                has_special = True
+            else:
+                continue
+            if has_lower and has_upper and has_digit and has_special:
+                break
 
         if has_lower:
             score += 10
@@ -154,12 +180,28 @@ class MasterPasswordDialog(QDialog):
 class CreatePasswordDialog(QDialog):
     """Диалог для создания нового мастер-пароля."""
 
+    # Текст и стиль метки силы по группам (см. _strength_bucket)
+    _STRENGTH_TEXTS = ("Слабый пароль", "Средний пароль", "Хороший пароль", "Отличный пароль!")
+    _STRENGTH_STYLES = (
+        "color: #ff4444; font-size: 11px;",
+        "color: #ffaa00; font-size: 11px;",
+        "color: #88cc00; font-size: 11px;",
+        "color: #00cc44; font-size: 11px;",
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Создание мастер-пароля")
         self.setModal(True)
         self.setMinimumWidth(400)
         self.password = None
+        self._last_strength_bucket = -1
+
+        # Debounce: серия нажатий схлопывается в один пересчёт
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(75)
+        self._debounce.timeout.connect(self._do_update)
 
         self._setup_ui()
 
@@ -242,26 +284,22 @@ class CreatePasswordDialog(QDialog):
         self.confirm_input.setEchoMode(mode)
 
     def _on_password_changed(self, text: str):
-        self.strength_indicator.update_strength(text)
-
-        # Текстовая оценка
-        strength = self.strength_indicator.value()
-        if strength < 30:
-            self.strength_label.setText("Слабый пароль")
-            self.strength_label.setStyleSheet("color: #ff4444; font-size: 11px;")
-        elif strength < 60:
-            self.strength_label.setText("Средний пароль")
-            self.strength_label.setStyleSheet("color: #ffaa00; font-size: 11px;")
-        elif strength < 80:
-            self.strength_label.setText("Хороший пароль")
-            self.strength_label.setStyleSheet("color: #88cc00; font-size: 11px;")
-        else:
-            self.strength_label.setText("Отличный пароль!")
-            self.strength_label.setStyleSheet("color: #00cc44; font-size: 11px;")
-
-        self._validate()
+        self._debounce.start()
 
     def _on_confirm_changed(self, text: str):
+        self._debounce.start()
+
+    def _do_update(self):
+        """Пересчёт силы пароля и валидация после паузы в вводе."""
+        self.strength_indicator.update_strength(self.password_input.text())
+
+        # Текстовая оценка — обновляем только при смене группы
+        bucket = _strength_bucket(self.strength_indicator.value())
+        if bucket != self._last_strength_bucket:
+            self.strength_label.setText(self._STRENGTH_TEXTS[bucket])
+            self.strength_label.setStyleSheet(self._STRENGTH_STYLES[bucket])
+            self._last_strength_bucket = bucket
+
         self._validate()
 
     def _validate(self):
@@ -279,15 +317,23 @@ class CreatePasswordDialog(QDialog):
         else:
             self.match_label.setText("")
 
-        # Активация кнопки
-        is_valid = (
-            len(password) >= 8 and
-            password == confirm and
-            self.strength_indicator.value() >= 30
-        )
-        self.ok_btn.setEnabled(is_valid)
+        # Активация кнопки — короткий пароль не может быть валидным
+        if len(password) < 8:
+            if self.ok_btn.isEnabled():
+                self.ok_btn.setEnabled(False)
+            return
+
+        is_valid = password == confirm and self.strength_indicator.value() >= 30
+        if self.ok_btn.isEnabled() != is_valid:
+            self.ok_btn.setEnabled(is_valid)
 
     def _on_ok(self):
+        # Не даём отложенной валидации отстать от текущего ввода
+        if self._debounce.isActive():
+            self._debounce.stop()
+            self._do_update()
+            if not self.ok_btn.isEnabled():
+                return
         self.password = self.password_input.text()
         self.accept()
 
@@ -10,7 +10,25 @@ from PyQt6.QtWidgets import (
     QPushButton, QCheckBox, QTabWidget, QWidget,
     QMessageBox
 )
-from PyQt6.QtCore import Qt, QSettings
+from PyQt6.QtCore import Qt, QSettings, QSignalBlocker
+
+# Default network choices — index matches network_combo order
+_NETWORK_NAMES = ("BNB Mainnet", "Ethereum Mainnet", "Base Mainnet")
+_RPC_URLS = (
+    "https://bsc-dataseed.binance.org/",              # BNB Mainnet
+    "https://eth.llamarpc.com",                        # Ethereum Mainnet
+    "https://rpc.ankr.com/base/1677373bc1c6f2038245f65cc3cddd165531f1e95dd90d9aad42d0c4e494d40d",  # Base Mainnet
+)
+
+
+def _labeled_row(label_text: str, widget, stretch: bool = False) -> QHBoxLayout:
+    """Row layout: label followed by widget, optionally right-padded with a stretch."""
+    row = QHBoxLayout()
+    row.addWidget(QLabel(label_text))
+    row.addWidget(widget)
+    if stretch:
+        row.addStretch()
+    return row
 
 
 class SettingsDialog(QDialog):
@@ -37,29 +55,68 @@ class SettingsDialog(QDialog):
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
-        # Tab widget
+        # Tab widget — only Network is built up front, other tabs on first view
         tabs = QTabWidget()
 
-        # Network Tab
-        network_tab = QWidget()
+        self._tab_specs = (
+            ("Network", self._build_network_tab, self._load_network_tab, self._network_tab_values),
+            ("Transactions", self._build_tx_tab, self._load_tx_tab, self._tx_tab_values),
+            ("Calculator", self._build_calc_tab, self._load_calc_tab, self._calc_tab_values),
+            ("Appearance", self._build_appearance_tab, self._load_appearance_tab, self._appearance_tab_values),
+            ("OKX DEX", self._build_okx_tab, self._load_okx_tab, self._okx_tab_values),
+            ("Codex API", self._build_codex_tab, self._load_codex_tab, self._codex_tab_values),
+        )
+        self._pending_tabs = {}  # {index: placeholder widget} — not built yet
+        self._built_tabs = set()
+        self._initial = {}
+        for index, (title, build, _load, _values) in enumerate(self._tab_specs):
+            tab = QWidget()
+            tabs.addTab(tab, title)
+            if index == 0:
+                build(tab)
+                self._built_tabs.add(index)
+            else:
+                self._pending_tabs[index] = tab
+        tabs.currentChanged.connect(self._ensure_tab_built)
+
+        layout.addWidget(tabs)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+
+        reset_btn = QPushButton("Reset to Defaults")
+        reset_btn.clicked.connect(self.reset_defaults)
+        button_layout.addWidget(reset_btn)
+
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+
+        save_btn = QPushButton("Save")
+        save_btn.setObjectName("primaryButton")
+        save_btn.clicked.connect(self.save_settings)
+        button_layout.addWidget(save_btn)
+
+        layout.addLayout(button_layout)
+
+    def _build_network_tab(self, network_tab):
+        """Network tab: default RPC/network and proxy."""
         network_layout = QVBoxLayout(network_tab)
 
         network_group = QGroupBox("Default Network Settings")
         network_group_layout = QVBoxLayout(network_group)
 
         # Default RPC URL
-        rpc_row = QHBoxLayout()
-        rpc_row.addWidget(QLabel("Default RPC URL:"))
         self.rpc_input = QLineEdit()
-        self.rpc_input.setPlaceholderText("https://bsc-dataseed.binance.org/")
-        rpc_row.addWidget(self.rpc_input)
-        network_group_layout.addLayout(rpc_row)
+        self.rpc_input.setPlaceholderText(_RPC_URLS[0])
+        network_group_layout.addLayout(_labeled_row("Default RPC URL:", self.rpc_input))
 
         # Default network
         network_row = QHBoxLayout()
         network_row.addWidget(QLabel("Default Network:"))
         self.network_combo = QComboBox()
-        self.network_combo.addItems(["BNB Mainnet", "Ethereum Mainnet", "Base Mainnet"])
+        self.network_combo.addItems(_NETWORK_NAMES)
         self.network_combo.currentIndexChanged.connect(self.on_network_changed)
         network_row.addWidget(self.network_combo)
         network_row.addWidget(QLabel(""))
@@ -72,24 +129,17 @@ class SettingsDialog(QDialog):
         proxy_group_layout = QVBoxLayout(proxy_group)
 
         # Proxy type
-        proxy_type_row = QHBoxLayout()
-        proxy_type_row.addWidget(QLabel("Type:"))
         self.proxy_type_combo = QComboBox()
         self.proxy_type_combo.addItems(["None", "SOCKS5", "HTTP"])
         self.proxy_type_combo.setMaximumWidth(100)
         self.proxy_type_combo.currentIndexChanged.connect(self._on_proxy_type_changed)
-        proxy_type_row.addWidget(self.proxy_type_combo)
-        proxy_type_row.addStretch()
-        proxy_group_layout.addLayout(proxy_type_row)
+        proxy_group_layout.addLayout(_labeled_row("Type:", self.proxy_type_combo, stretch=True))
 
         # Proxy address
-        proxy_addr_row = QHBoxLayout()
-        proxy_addr_row.addWidget(QLabel("Address:"))
         self.proxy_addr_input = QLineEdit()
         self.proxy_addr_input.setPlaceholderText("host:port (e.g. 127.0.0.1:1080)")
         self.proxy_addr_input.setEnabled(False)
-        proxy_addr_row.addWidget(self.proxy_addr_input)
-        proxy_group_layout.addLayout(proxy_addr_row)
+        proxy_group_layout.addLayout(_labeled_row("Address:", self.proxy_addr_input))
 
         # Proxy auth
         proxy_auth_row = QHBoxLayout()
@@ -110,40 +160,29 @@ class SettingsDialog(QDialog):
 
         network_layout.addWidget(proxy_group)
         network_layout.addStretch()
-        tabs.addTab(network_tab, "Network")
 
-        # Transaction Tab
-        tx_tab = QWidget()
+    def _build_tx_tab(self, tx_tab):
+        """Transactions tab: slippage, gas and safety limits."""
         tx_layout = QVBoxLayout(tx_tab)
 
         tx_group = QGroupBox("Transaction Settings")
         tx_group_layout = QVBoxLayout(tx_group)
 
         # Default slippage
-        slip_row = QHBoxLayout()
-        slip_row.addWidget(QLabel("Default Slippage:"))
         self.slippage_spin = QDoubleSpinBox()
         self.slippage_spin.setRange(0.1, 5.0)
         self.slippage_spin.setValue(0.5)
         self.slippage_spin.setSuffix(" %")
-        slip_row.addWidget(self.slippage_spin)
-        slip_row.addStretch()
-        tx_group_layout.addLayout(slip_row)
+        tx_group_layout.addLayout(_labeled_row("Default Slippage:", self.slippage_spin, stretch=True))
 
         # Gas multiplier
-        gas_row = QHBoxLayout()
-        gas_row.addWidget(QLabel("Gas Limit Multiplier:"))
         self.gas_multiplier_spin = QDoubleSpinBox()
         self.gas_multiplier_spin.setRange(1.0, 2.0)
         self.gas_multiplier_spin.setValue(1.2)
         self.gas_multiplier_spin.setSingleStep(0.1)
-        gas_row.addWidget(self.gas_multiplier_spin)
-        gas_row.addStretch()
-        tx_group_layout.addLayout(gas_row)
+        tx_group_layout.addLayout(_labeled_row("Gas Limit Multiplier:", self.gas_multiplier_spin, stretch=True))
 
         # Gas limit override
-        gas_limit_row = QHBoxLayout()
-        gas_limit_row.addWidget(QLabel("Gas Limit Override:"))
         self.gas_limit_spin = QDoubleSpinBox()
         self.gas_limit_spin.setRange(0, 10000000)
         self.gas_limit_spin.setValue(0)
@@ -151,13 +190,9 @@ class SettingsDialog(QDialog):
         self.gas_limit_spin.setSingleStep(100000)
         self.gas_limit_spin.setSpecialValueText("Auto")
         self.gas_limit_spin.setToolTip("0 = auto-estimate gas. Set manually for congested networks (e.g. 500000)")
-        gas_limit_row.addWidget(self.gas_limit_spin)
-        gas_limit_row.addStretch()
-        tx_group_layout.addLayout(gas_limit_row)
+        tx_group_layout.addLayout(_labeled_row("Gas Limit Override:", self.gas_limit_spin, stretch=True))
 
         # Gas price cap (gwei) — safety net against gas spikes
-        gas_cap_row = QHBoxLayout()
-        gas_cap_row.addWidget(QLabel("Gas Price Cap:"))
         self.gas_price_cap_spin = QDoubleSpinBox()
         self.gas_price_cap_spin.setRange(0, 1000)
         self.gas_price_cap_spin.setValue(0)
@@ -169,33 +204,23 @@ class SettingsDialog(QDialog):
             "Block any TX if current gas price exceeds this cap.\n"
             "0 = disabled. Recommended: 5 Gwei (BSC), 50 Gwei (Ethereum), 0.5 Gwei (Base)."
         )
-        gas_cap_row.addWidget(self.gas_price_cap_spin)
-        gas_cap_row.addStretch()
-        tx_group_layout.addLayout(gas_cap_row)
+        tx_group_layout.addLayout(_labeled_row("Gas Price Cap:", self.gas_price_cap_spin, stretch=True))
 
         # Transaction timeout
-        timeout_row = QHBoxLayout()
-        timeout_row.addWidget(QLabel("Transaction Timeout:"))
         self.timeout_spin = QDoubleSpinBox()
         self.timeout_spin.setRange(60, 600)
         self.timeout_spin.setValue(300)
         self.timeout_spin.setSuffix(" sec")
-        timeout_row.addWidget(self.timeout_spin)
-        timeout_row.addStretch()
-        tx_group_layout.addLayout(timeout_row)
+        tx_group_layout.addLayout(_labeled_row("Transaction Timeout:", self.timeout_spin, stretch=True))
 
         # Max price impact
-        impact_row = QHBoxLayout()
-        impact_row.addWidget(QLabel("Max Price Impact:"))
         self.price_impact_spin = QDoubleSpinBox()
         self.price_impact_spin.setRange(0, 50.0)
         self.price_impact_spin.setValue(5.0)
         self.price_impact_spin.setSuffix(" %")
         self.price_impact_spin.setSpecialValueText("Disabled")
         self.price_impact_spin.setToolTip("Max allowed price impact for swaps (0 = disabled). Blocks swaps if pool price would move too much.")
-        impact_row.addWidget(self.price_impact_spin)
-        impact_row.addStretch()
-        tx_group_layout.addLayout(impact_row)
+        tx_group_layout.addLayout(_labeled_row("Max Price Impact:", self.price_impact_spin, stretch=True))
 
         # Simulate first checkbox
         self.simulate_check = QCheckBox("Always simulate before executing")
@@ -204,127 +229,92 @@ class SettingsDialog(QDialog):
 
         tx_layout.addWidget(tx_group)
         tx_layout.addStretch()
-        tabs.addTab(tx_tab, "Transactions")
 
-        # Calculator Tab
-        calc_tab = QWidget()
+    def _build_calc_tab(self, calc_tab):
+        """Calculator tab: ladder defaults."""
         calc_layout = QVBoxLayout(calc_tab)
 
         calc_group = QGroupBox("Calculator Defaults")
         calc_group_layout = QVBoxLayout(calc_group)
 
         # Default distribution
-        dist_row = QHBoxLayout()
-        dist_row.addWidget(QLabel("Default Distribution:"))
         self.dist_combo = QComboBox()
         self.dist_combo.addItems(["Linear", "Quadratic", "Exponential", "Fibonacci"])
-        dist_row.addWidget(self.dist_combo)
-        calc_group_layout.addLayout(dist_row)
+        calc_group_layout.addLayout(_labeled_row("Default Distribution:", self.dist_combo))
 
         # Default fee tier
-        fee_row = QHBoxLayout()
-        fee_row.addWidget(QLabel("Default Fee Tier:"))
         self.fee_combo = QComboBox()
         self.fee_combo.addItems(["0.05%", "0.25%", "0.30%", "1.00%"])
         self.fee_combo.setCurrentIndex(1)
-        fee_row.addWidget(self.fee_combo)
-        calc_group_layout.addLayout(fee_row)
+        calc_group_layout.addLayout(_labeled_row("Default Fee Tier:", self.fee_combo))
 
         # Default positions
-        pos_row = QHBoxLayout()
-        pos_row.addWidget(QLabel("Default Positions:"))
         self.positions_spin = QSpinBox()
         self.positions_spin.setRange(1, 20)
         self.positions_spin.setValue(7)
-        pos_row.addWidget(self.positions_spin)
-        pos_row.addStretch()
-        calc_group_layout.addLayout(pos_row)
+        calc_group_layout.addLayout(_labeled_row("Default Positions:", self.positions_spin, stretch=True))
 
         calc_layout.addWidget(calc_group)
         calc_layout.addStretch()
-        tabs.addTab(calc_tab, "Calculator")
 
-        # Appearance Tab
-        appearance_tab = QWidget()
+    def _build_appearance_tab(self, appearance_tab):
+        """Appearance tab: theme and font size."""
         appearance_layout = QVBoxLayout(appearance_tab)
 
         appearance_group = QGroupBox("Appearance")
         appearance_group_layout = QVBoxLayout(appearance_group)
 
         # Theme selection
-        theme_row = QHBoxLayout()
-        theme_row.addWidget(QLabel("Theme:"))
         self.theme_combo = QComboBox()
         self.theme_combo.addItems(["Dark (Default)", "Light"])
-        theme_row.addWidget(self.theme_combo)
-        appearance_group_layout.addLayout(theme_row)
+        appearance_group_layout.addLayout(_labeled_row("Theme:", self.theme_combo))
 
         # Font size
-        font_row = QHBoxLayout()
-        font_row.addWidget(QLabel("Font Size:"))
         self.font_combo = QComboBox()
         self.font_combo.addItems(["Small", "Medium", "Large"])
         self.font_combo.setCurrentIndex(1)
-        font_row.addWidget(self.font_combo)
-        appearance_group_layout.addLayout(font_row)
+        appearance_group_layout.addLayout(_labeled_row("Font Size:", self.font_combo))
 
         appearance_layout.addWidget(appearance_group)
         appearance_layout.addStretch()
-        tabs.addTab(appearance_tab, "Appearance")
 
-        # OKX DEX Tab
-        okx_tab = QWidget()
+    def _build_okx_tab(self, okx_tab):
+        """OKX DEX tab: API credentials and swap slippage."""
         okx_layout = QVBoxLayout(okx_tab)
 
         okx_group = QGroupBox("OKX DEX API Settings")
         okx_group_layout = QVBoxLayout(okx_group)
 
         # API Key
-        api_key_row = QHBoxLayout()
-        api_key_row.addWidget(QLabel("API Key:"))
         self.okx_api_key_input = QLineEdit()
         self.okx_api_key_input.setPlaceholderText("Enter your OKX DEX API key")
         self.okx_api_key_input.setEchoMode(QLineEdit.EchoMode.Password)
-        api_key_row.addWidget(self.okx_api_key_input)
-        okx_group_layout.addLayout(api_key_row)
+        okx_group_layout.addLayout(_labeled_row("API Key:", self.okx_api_key_input))
 
         # Secret Key
-        secret_row = QHBoxLayout()
-        secret_row.addWidget(QLabel("Secret Key:"))
         self.okx_secret_input = QLineEdit()
         self.okx_secret_input.setPlaceholderText("Enter your OKX DEX secret key")
         self.okx_secret_input.setEchoMode(QLineEdit.EchoMode.Password)
-        secret_row.addWidget(self.okx_secret_input)
-        okx_group_layout.addLayout(secret_row)
+        okx_group_layout.addLayout(_labeled_row("Secret Key:", self.okx_secret_input))
 
         # Passphrase
-        pass_row = QHBoxLayout()
-        pass_row.addWidget(QLabel("Passphrase:"))
         self.okx_passphrase_input = QLineEdit()
         self.okx_passphrase_input.setPlaceholderText("Enter your OKX DEX passphrase")
         self.okx_passphrase_input.setEchoMode(QLineEdit.EchoMode.Password)
-        pass_row.addWidget(self.okx_passphrase_input)
-        okx_group_layout.addLayout(pass_row)
+        okx_group_layout.addLayout(_labeled_row("Passphrase:", self.okx_passphrase_input))
 
         # Project ID (optional)
-        project_row = QHBoxLayout()
-        project_row.addWidget(QLabel("Project ID:"))
         self.okx_project_input = QLineEdit()
         self.okx_project_input.setPlaceholderText("Optional project ID")
-        project_row.addWidget(self.okx_project_input)
-        okx_group_layout.addLayout(project_row)
+        okx_group_layout.addLayout(_labeled_row("Project ID:", self.okx_project_input))
 
         # Default swap slippage
-        swap_slip_row = QHBoxLayout()
-        swap_slip_row.addWidget(QLabel("Swap Slippage:"))
         self.okx_slippage_spin = QDoubleSpinBox()
         self.okx_slippage_spin.setRange(0.1, 50.0)
         self.okx_slippage_spin.setValue(1.0)
         self.okx_slippage_spin.setSuffix(" %")
         self.okx_slippage_spin.setToolTip("Slippage for auto-sell swaps")
-        swap_slip_row.addWidget(self.okx_slippage_spin)
-        swap_slip_row.addStretch()
-        okx_group_layout.addLayout(swap_slip_row)
+        okx_group_layout.addLayout(_labeled_row("Swap Slippage:", self.okx_slippage_spin, stretch=True))
 
         # Info label
         info_label = QLabel(
@@ -337,22 +327,18 @@ class SettingsDialog(QDialog):
 
         okx_layout.addWidget(okx_group)
         okx_layout.addStretch()
-        tabs.addTab(okx_tab, "OKX DEX")
 
-        # Codex API Tab (pool search by token address)
-        codex_tab = QWidget()
+    def _build_codex_tab(self, codex_tab):
+        """Codex API tab: pool search key."""
         codex_layout = QVBoxLayout(codex_tab)
 
         codex_group = QGroupBox("Codex API (Pool Search)")
         codex_group_layout = QVBoxLayout(codex_group)
 
-        codex_key_row = QHBoxLayout()
-        codex_key_row.addWidget(QLabel("API Key:"))
         self.codex_api_key_input = QLineEdit()
         self.codex_api_key_input.setPlaceholderText("Enter your Codex API key")
         self.codex_api_key_input.setEchoMode(QLineEdit.EchoMode.Password)
-        codex_key_row.addWidget(self.codex_api_key_input)
-        codex_group_layout.addLayout(codex_key_row)
+        codex_group_layout.addLayout(_labeled_row("API Key:", self.codex_api_key_input))
 
         codex_info = QLabel(
             "Get a free API key at: dashboard.codex.io\n"
@@ -365,28 +351,17 @@ class SettingsDialog(QDialog):
 
         codex_layout.addWidget(codex_group)
         codex_layout.addStretch()
-        tabs.addTab(codex_tab, "Codex API")
-
-        layout.addWidget(tabs)
-
-        # Buttons
-        button_layout = QHBoxLayout()
-        button_layout.addStretch()
-
-        reset_btn = QPushButton("Reset to Defaults")
-        reset_btn.clicked.connect(self.reset_defaults)
-        button_layout.addWidget(reset_btn)
 
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.clicked.connect(self.reject)
-        button_layout.addWidget(cancel_btn)
-
-        save_btn = QPushButton("Save")
-        save_btn.setObjectName("primaryButton")
-        save_btn.clicked.connect(self.save_settings)
-        button_layout.addWidget(save_btn)
-
-        layout.addLayout(button_layout)
+    def _ensure_tab_built(self, index):
+        """Build a tab on first view and load its settings."""
+        tab = self._pending_tabs.pop(index, None)
+        if tab is None:
+            return
+        _title, build, load, _values = self._tab_specs[index]
+        build(tab)
+        self._built_tabs.add(index)
+        load(self.settings)
+        self._snapshot_initial((index,))
 
     def _on_proxy_type_changed(self, index):
         """Enable/disable proxy inputs based on type."""
@@ -397,127 +372,186 @@ class SettingsDialog(QDialog):
 
     def on_network_changed(self, index):
         """Auto-update RPC URL when network changes."""
-        rpc_urls = {
-            0: "https://bsc-dataseed.binance.org/",              # BNB Mainnet
-            1: "https://eth.llamarpc.com",                        # Ethereum Mainnet
-            2: "https://rpc.ankr.com/base/1677373bc1c6f2038245f65cc3cddd165531f1e95dd90d9aad42d0c4e494d40d",  # Base Mainnet
-        }
-        if index in rpc_urls:
-            self.rpc_input.setText(rpc_urls[index])
+        if 0 <= index < len(_RPC_URLS):
+            self.rpc_input.setText(_RPC_URLS[index])
 
     def load_settings(self):
-        """Load settings from QSettings."""
-        self.rpc_input.setText(
-            self.settings.value("network/rpc_url", "https://bsc-dataseed.binance.org/")
-        )
-        self.network_combo.setCurrentIndex(
-            self.settings.value("network/default_network", 0, type=int)
-        )
-        self.slippage_spin.setValue(
-            self.settings.value("tx/slippage", 0.5, type=float)
-        )
-        self.gas_multiplier_spin.setValue(
-            self.settings.value("tx/gas_multiplier", 1.2, type=float)
-        )
-        self.gas_limit_spin.setValue(
-            self.settings.value("tx/gas_limit_override", 0, type=float)
-        )
-        self.gas_price_cap_spin.setValue(
-            self.settings.value("tx/gas_price_cap_gwei", 0.0, type=float)
-        )
-        self.timeout_spin.setValue(
-            self.settings.value("tx/timeout", 600, type=float)
-        )
-        self.simulate_check.setChecked(
-            self.settings.value("tx/simulate_first", True, type=bool)
-        )
-        self.price_impact_spin.setValue(
-            self.settings.value("tx/max_price_impact", 5.0, type=float)
-        )
-        self.dist_combo.setCurrentIndex(
-            self.settings.value("calc/distribution", 0, type=int)
-        )
-        self.fee_combo.setCurrentIndex(
-            self.settings.value("calc/fee_tier", 1, type=int)
-        )
-        self.positions_spin.setValue(
-            self.settings.value("calc/positions", 7, type=int)
-        )
-        self.theme_combo.setCurrentIndex(
-            self.settings.value("appearance/theme", 0, type=int)
-        )
-        self.font_combo.setCurrentIndex(
-            self.settings.value("appearance/font_size", 1, type=int)
-        )
-        # Proxy settings
-        self.proxy_type_combo.setCurrentIndex(
-            self.settings.value("proxy/type", 0, type=int)
-        )
-        self.proxy_addr_input.setText(
-            self.settings.value("proxy/address", "")
-        )
-        self.proxy_user_input.setText(
-            self.settings.value("proxy/username", "")
-        )
-        self.proxy_pass_input.setText(
-            self.settings.value("proxy/password", "")
-        )
-        # OKX DEX settings
-        self.okx_api_key_input.setText(
-            self.settings.value("okx/api_key", "")
-        )
-        self.okx_secret_input.setText(
-            self.settings.value("okx/secret_key", "")
-        )
-        self.okx_passphrase_input.setText(
-            self.settings.value("okx/passphrase", "")
-        )
-        self.okx_project_input.setText(
-            self.settings.value("okx/project_id", "")
-        )
-        self.okx_slippage_spin.setValue(
-            self.settings.value("okx/slippage", 1.0, type=float)
-        )
-        # Codex API
-        self.codex_api_key_input.setText(
-            self.settings.value("codex/api_key", "")
-        )
+        """Load settings from QSettings into the tabs built so far."""
+        st = self.settings
+        for index in sorted(self._built_tabs):
+            self._tab_specs[index][2](st)
+        self._initial = {}
+        self._snapshot_initial(self._built_tabs)
+
+    def _load_network_tab(self, st):
+        # Restoring combo indices must not fire change handlers — on_network_changed
+        # would overwrite the saved RPC URL with the network default.
+        st.beginGroup("network")
+        with QSignalBlocker(self.network_combo):
+            self.network_combo.setCurrentIndex(st.value("default_network", 0, type=int))
+        self.rpc_input.setText(st.value("rpc_url", _RPC_URLS[0]))
+        st.endGroup()
+
+        # Proxy settings (signals left on — the handler syncs input enabled state)
+        st.beginGroup("proxy")
+        self.proxy_type_combo.setCurrentIndex(st.value("type", 0, type=int))
+        self.proxy_addr_input.setText(st.value("address", ""))
+        self.proxy_user_input.setText(st.value("username", ""))
+        self.proxy_pass_input.setText(st.value("password", ""))
+        st.endGroup()
+
+    def _load_tx_tab(self, st):
+        st.beginGroup("tx")
+        self.slippage_spin.setValue(st.value("slippage", 0.5, type=float))
+        self.gas_multiplier_spin.setValue(st.value("gas_multiplier", 1.2, type=float))
+        self.gas_limit_spin.setValue(st.value("gas_limit_override", 0, type=float))
+        self.gas_price_cap_spin.setValue(st.value("gas_price_cap_gwei", 0.0, type=float))
+        self.timeout_spin.setValue(st.value("timeout", 600, type=float))
+        self.simulate_check.setChecked(st.value("simulate_first", True, type=bool))
+        self.price_impact_spin.setValue(st.value("max_price_impact", 5.0, type=float))
+        st.endGroup()
+
+    def _load_calc_tab(self, st):
+        st.beginGroup("calc")
+        with QSignalBlocker(self.dist_combo):
+            self.dist_combo.setCurrentIndex(st.value("distribution", 0, type=int))
+        with QSignalBlocker(self.fee_combo):
+            self.fee_combo.setCurrentIndex(st.value("fee_tier", 1, type=int))
+        self.positions_spin.setValue(st.value("positions", 7, type=int))
+        st.endGroup()
+
+    def _load_appearance_tab(self, st):
+        st.beginGroup("appearance")
+        with QSignalBlocker(self.theme_combo):
+            self.theme_combo.setCurrentIndex(st.value("theme", 0, type=int))
+        with QSignalBlocker(self.font_combo):
+            self.font_combo.setCurrentIndex(st.value("font_size", 1, type=int))
+        st.endGroup()
+
+    def _load_okx_tab(self, st):
+        st.beginGroup("okx")
+        self.okx_api_key_input.setText(st.value("api_key", ""))
+        self.okx_secret_input.setText(st.value("secret_key", ""))
+        self.okx_passphrase_input.setText(st.value("passphrase", ""))
+        self.okx_project_input.setText(st.value("project_id", ""))
+        self.okx_slippage_spin.setValue(st.value("slippage", 1.0, type=float))
+        st.endGroup()
+
+    def _load_codex_tab(self, st):
+        st.beginGroup("codex")
+        self.codex_api_key_input.setText(st.value("api_key", ""))
+        st.endGroup()
+
+    def _network_tab_values(self) -> dict:
+        return {
+            "network": {
+                "rpc_url": self.rpc_input.text(),
+                "default_network": self.network_combo.currentIndex(),
+            },
+            "proxy": {
+                "type": self.proxy_type_combo.currentIndex(),
+                "address": self.proxy_addr_input.text().strip(),
+                "username": self.proxy_user_input.text().strip(),
+                "password": self.proxy_pass_input.text(),
+            },
+        }
+
+    def _tx_tab_values(self) -> dict:
+        return {
+            "tx": {
+                "slippage": self.slippage_spin.value(),
+                "gas_multiplier": self.gas_multiplier_spin.value(),
+                "gas_limit_override": int(self.gas_limit_spin.value()),
+                "gas_price_cap_gwei": self.gas_price_cap_spin.value(),
+                "timeout": self.timeout_spin.value(),
+                "simulate_first": self.simulate_check.isChecked(),
+                "max_price_impact": self.price_impact_spin.value(),
+            },
+        }
+
+    def _calc_tab_values(self) -> dict:
+        return {
+            "calc": {
+                "distribution": self.dist_combo.currentIndex(),
+                "fee_tier": self.fee_combo.currentIndex(),
+                "positions": self.positions_spin.value(),
+            },
+        }
+
+    def _appearance_tab_values(self) -> dict:
+        return {
+            "appearance": {
+                "theme": self.theme_combo.currentIndex(),
+                "font_size": self.font_combo.currentIndex(),
+            },
+        }
+
+    def _okx_tab_values(self) -> dict:
+        return {
+            "okx": {
+                "api_key": self.okx_api_key_input.text(),
+                "secret_key": self.okx_secret_input.text(),
+                "passphrase": self.okx_passphrase_input.text(),
+                "project_id": self.okx_project_input.text(),
+                "slippage": self.okx_slippage_spin.value(),
+            },
+        }
+
+    def _codex_tab_values(self) -> dict:
+        return {
+            "codex": {
+                "api_key": self.codex_api_key_input.text(),
+            },
+        }
+
+    def _collect_values(self, indices=None) -> dict:
+        """Widget values of built tabs as {group: {key: value}} — exactly what save_settings writes.
+
+        Tabs never opened are left out: the user could not have changed them.
+        """
+        values = {}
+        for index in sorted(self._built_tabs if indices is None else indices):
+            values.update(self._tab_specs[index][3]())
+        return values
+
+    def _snapshot_initial(self, indices):
+        """Remember loaded values of keys already stored, so save can skip unchanged ones.
+
+        Keys missing from storage are left out — they are always written on save,
+        so other readers stop falling back to their own defaults.
+        """
+        st = self.settings
+        for group, values in self._collect_values(indices).items():
+            st.beginGroup(group)
+            self._initial[group] = {k: v for k, v in values.items() if st.contains(k)}
+            st.endGroup()
 
     def save_settings(self):
-        """Save settings to QSettings."""
-        self.settings.setValue("network/rpc_url", self.rpc_input.text())
-        self.settings.setValue("network/default_network", self.network_combo.currentIndex())
-        self.settings.setValue("tx/slippage", self.slippage_spin.value())
-        self.settings.setValue("tx/gas_multiplier", self.gas_multiplier_spin.value())
-        self.settings.setValue("tx/gas_limit_override", int(self.gas_limit_spin.value()))
-        self.settings.setValue("tx/gas_price_cap_gwei", self.gas_price_cap_spin.value())
+        """Save changed settings to QSettings."""
+        st = self.settings
+        written = 0
+
+        for group, values in self._collect_values().items():
+            old = self._initial.get(group, {})
+            changed = [(k, v) for k, v in values.items() if k not in old or old[k] != v]
+            if not changed:
+                continue
+            st.beginGroup(group)
+            for key, value in changed:
+                st.setValue(key, value)
+            st.endGroup()
+            written += len(changed)
+
+        if written:
+            st.sync()
+
         # Apply cap immediately so newly-sent TXs respect the change without app restart.
-        try:
-            from src.utils import set_gas_price_cap
-            set_gas_price_cap(self.gas_price_cap_spin.value())
-        except Exception:
-            pass
-        self.settings.setValue("tx/timeout", self.timeout_spin.value())
-        self.settings.setValue("tx/simulate_first", self.simulate_check.isChecked())
-        self.settings.setValue("tx/max_price_impact", self.price_impact_spin.value())
-        self.settings.setValue("calc/distribution", self.dist_combo.currentIndex())
-        self.settings.setValue("calc/fee_tier", self.fee_combo.currentIndex())
-        self.settings.setValue("calc/positions", self.positions_spin.value())
-        self.settings.setValue("appearance/theme", self.theme_combo.currentIndex())
-        self.settings.setValue("appearance/font_size", self.font_combo.currentIndex())
-        # Proxy settings
-        self.settings.setValue("proxy/type", self.proxy_type_combo.currentIndex())
-        self.settings.setValue("proxy/address", self.proxy_addr_input.text().strip())
-        self.settings.setValue("proxy/username", self.proxy_user_input.text().strip())
-        self.settings.setValue("proxy/password", self.proxy_pass_input.text())
-        # OKX DEX settings
-        self.settings.setValue("okx/api_key", self.okx_api_key_input.text())
-        self.settings.setValue("okx/secret_key", self.okx_secret_input.text())
-        self.settings.setValue("okx/passphrase", self.okx_passphrase_input.text())
-        self.settings.setValue("okx/project_id", self.okx_project_input.text())
-        self.settings.setValue("okx/slippage", self.okx_slippage_spin.value())
-        # Codex API
-        self.settings.setValue("codex/api_key", self.codex_api_key_input.text())
+        if 1 in self._built_tabs:  # Transactions tab holds the cap
+            try:
+                from src.utils import set_gas_price_cap
+                set_gas_price_cap(self.gas_price_cap_spin.value())
+            except Exception:
+                pass
 
         self.accept()
 
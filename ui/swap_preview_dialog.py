@@ -6,26 +6,101 @@ Swap Preview Dialog
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List, Optional
 
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QHeaderView, QAbstractItemView, QProgressBar
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont
-from web3 import Web3
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor, QBrush
 
+from config import STABLECOIN_ADDRESSES
 from src.dex_swap import DexSwap
+from src.kyberswap import KYBER_HTTP_POOL_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Котировки — чистый I/O (HTTP Kyber + eth_call), GIL отпускается на сокетах.
+# Совпадает с пулом keep-alive соединений KyberSwapClient.
+_MAX_QUOTE_THREADS = KYBER_HTTP_POOL_SIZE
+# Жёсткий дедлайн на котировку одного токена: зависший запрос не блокирует весь предпросмотр
+_QUOTE_TIMEOUT_SEC = 20.0
+# Готовые котировки отдаются в UI пачками: не чаще раза в интервал или по набору пачки
+_QUOTE_BATCH_SIZE = 5
+_QUOTE_BATCH_INTERVAL_SEC = 0.2
+# Auto-режим: какой источник выиграл в прошлом предпросмотре на этой сети ("kyber" / "onchain")
+_PREFERRED_SOURCE = {}
+
+# DexSwap между предпросмотрами: контракты роутеров/квотера и keep-alive сессия Kyber
+# создаются один раз. Ключ держит ссылку на w3 через сам DexSwap, поэтому id(w3) не переиспользуется.
+_DEX_SWAP_CACHE = {}
+_DEX_SWAP_CACHE_MAX = 4
+_dex_swap_cache_lock = threading.Lock()
+
+# decimals выходных токенов {(chain_id, address_lower): decimals} — неизменяемы, читаем один раз за сессию
+_OUTPUT_DECIMALS = {}
+
+# Воркеры закрытых диалогов, ещё не вышедшие из run(): держим ссылку до finished,
+# иначе GC уничтожит QThread посреди работы
+_DETACHED_WORKERS = set()
+
+# Успешные котировки между открытиями предпросмотра (LRU). Ключ включает номер блока,
+# округлённый до _QUOTE_CACHE_BLOCKS — повторный предпросмотр в пределах пары блоков бесплатен.
+_QUOTE_CACHE = OrderedDict()
+_QUOTE_CACHE_MAX = 512
+_QUOTE_CACHE_BLOCKS = 3
+_quote_cache_lock = threading.Lock()
+
+_POW10 = {d: 10 ** d for d in range(0, 37)}
+
+
+def _format_balance(amount: int, decimals: int) -> str:
+    """Баланс в человеческом виде (6 знаков, усечение) без перевода в float."""
+    denom = _POW10.get(decimals) or 10 ** decimals
+    whole, frac = divmod(int(amount), denom)
+    return f"{whole:,}.{str(frac).zfill(decimals)[:6].ljust(6, '0')}"
+
+
+def _get_swapper(w3, chain_id: int, max_price_impact: float, proxy: Optional[dict]) -> DexSwap:
+    """DexSwap из кэша (или новый) для данного w3/сети/настроек."""
+    key = (chain_id, id(w3), max_price_impact, tuple(sorted((proxy or {}).items())))
+    with _dex_swap_cache_lock:
+        swapper = _DEX_SWAP_CACHE.get(key)
+        if swapper is None:
+            swapper = DexSwap(w3, chain_id, max_price_impact=max_price_impact, proxy=proxy)
+            if len(_DEX_SWAP_CACHE) >= _DEX_SWAP_CACHE_MAX:
+                old_key = next(iter(_DEX_SWAP_CACHE))
+                _DEX_SWAP_CACHE.pop(old_key).close()
+            _DEX_SWAP_CACHE[key] = swapper
+        return swapper
+
+
+def _quote_cache_get(key):
+    with _quote_cache_lock:
+        result = _QUOTE_CACHE.get(key)
+        if result is not None:
+            _QUOTE_CACHE.move_to_end(key)
+        return result
+
+
+def _quote_cache_put(key, result: dict):
+    with _quote_cache_lock:
+        _QUOTE_CACHE[key] = result
+        _QUOTE_CACHE.move_to_end(key)
+        while len(_QUOTE_CACHE) > _QUOTE_CACHE_MAX:
+            _QUOTE_CACHE.popitem(last=False)
+
 
 class QuoteWorker(QThread):
     """Фоновый поток для загрузки котировок."""
 
-    quote_ready = pyqtSignal(int, dict)   # (row_index, quote_data)
-    all_done = pyqtSignal(float)           # total_usd
+    quotes_batch = pyqtSignal(list)        # [(row_index, quote_data), ...]
+    all_done = pyqtSignal()
 
     def __init__(self, w3, chain_id: int, tokens: list, output_token: str,
                  max_price_impact: float = 5.0, proxy: dict = None,
@@ -38,73 +113,187 @@ class QuoteWorker(QThread):
         self.max_price_impact = max_price_impact
         self.proxy = proxy
         self.swap_mode = swap_mode
+        self._out_decimals = None  # decimals выходного токена — один раз на весь предпросмотр
+        self._batch = []
+        self._batch_started = 0.0
+
+    def _queue_quote(self, row: int, data: dict):
+        """Добавить котировку в пачку; пачка уходит в UI при наборе или по интервалу."""
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        self._batch.append((row, data))
+        if len(self._batch) >= _QUOTE_BATCH_SIZE:
+            self._flush_quotes(force=True)
+        else:
+            self._flush_quotes()
+
+    def _flush_quotes(self, force: bool = False):
+        """Отправить накопленные котировки одним сигналом."""
+        if not self._batch:
+            return
+        if not force and time.monotonic() - self._batch_started < _QUOTE_BATCH_INTERVAL_SEC:
+            return
+        batch, self._batch = self._batch, []
+        self.quotes_batch.emit(batch)
 
     def run(self):
         try:
-            swapper = DexSwap(self.w3, self.chain_id, max_price_impact=self.max_price_impact, proxy=self.proxy)
-            total_usd = 0.0
+            swapper = _get_swapper(self.w3, self.chain_id, self.max_price_impact, self.proxy)
+            dec_key = (self.chain_id, self.output_token.lower())
+            self._out_decimals = _OUTPUT_DECIMALS.get(dec_key)
+            if self._out_decimals is None:
+                try:
+                    self._out_decimals = _OUTPUT_DECIMALS[dec_key] = swapper.get_token_decimals(self.output_token)
+                except Exception as e:
+                    logger.warning(f"Output token decimals unavailable: {e}")
+            use_kyber = self.swap_mode in ("auto", "kyber")
+            use_onchain = self.swap_mode in ("auto", "v2", "v3")
+
+            try:
+                block_bucket = self.w3.eth.block_number // _QUOTE_CACHE_BLOCKS
+            except Exception as e:
+                logger.debug(f"Block number unavailable, quote cache disabled: {e}")
+                block_bucket = None
+            cache_keys = {}
 
+            output_lower = self.output_token.lower()
+
+            pending = []  # индексы токенов с ненулевым балансом и без котировки в кэше
             for i, token in enumerate(self.tokens):
-                try:
-                    amount = token.get('amount', 0)
-                    if amount == 0:
-                        self.quote_ready.emit(i, {
-                            'status': 'skip',
-                            'reason': 'Zero balance',
-                        })
+                if token.get('amount', 0) == 0:
+                    self._queue_quote(i, {
+                        'status': 'skip',
+                        'reason': 'Zero balance',
+                    })
+                    continue
+                # Выходной токен и USD-стейблы идут 1:1 — котировать их через Kyber/роутеры
+                # незачем. WBNB/WETH/нативный в STABLE_TOKENS тоже есть, но они не $1 —
+                # для них нужна настоящая котировка.
+                address_lower = token['address'].lower()
+                if address_lower == output_lower or address_lower in STABLECOIN_ADDRESSES:
+                    self._queue_quote(i, self._stable_result(token))
+                    continue
+                if block_bucket is not None:
+                    key = cache_keys[i] = (
+                        self.chain_id, token['address'].lower(), self.output_token.lower(),
+                        token['amount'], self.swap_mode, self.max_price_impact, block_bucket,
+                    )
+                    cached = _quote_cache_get(key)
+                    if cached is not None:
+                        self._queue_quote(i, cached)
                         continue
-
-                    result = self._get_best_quote(swapper, token['address'], amount)
-                    if result:
-                        total_usd += result['amount_out_human']
-                        self.quote_ready.emit(i, result)
+                pending.append(i)
+            self._flush_quotes(force=True)
+
+            # Источники по порядку: KyberSwap (HTTP, параллельно), V2/V3 (eth_call, один батч).
+            # Kyber не пробуем, если для сети нет клиента. В Auto первым идёт источник,
+            # выигравший в прошлый раз — следующий получает только то, что не котировалось.
+            phases = []
+            if use_kyber and (swapper.kyber_client is not None or not use_onchain):
+                phases.append(("kyber", self._kyber_quotes))
+            if use_onchain:
+                phases.append(("onchain", self._onchain_quotes))
+            if self.swap_mode == "auto" and _PREFERRED_SOURCE.get(self.chain_id) == "onchain":
+                phases.reverse()
+
+            wins = {}
+            remaining = pending
+            for n, (source, fetch) in enumerate(phases):
+                if not remaining:
+                    break  # всё уже из кэша/стейблы или котировано предыдущим источником
+                if self.isInterruptionRequested():
+                    return  # диалог закрыт — результаты уже никому не нужны
+                last = n == len(phases) - 1
+                failed = []
+                for i, result in fetch(swapper, remaining):
+                    if result.get('status') == 'ok':
+                        wins[source] = wins.get(source, 0) + 1
+                        if i in cache_keys:
+                            _quote_cache_put(cache_keys[i], result)
+                        self._queue_quote(i, result)
+                    elif last:
+                        self._queue_quote(i, result)
                     else:
-                        self.quote_ready.emit(i, {
-                            'status': 'error',
-                            'reason': 'No liquidity',
-                        })
+                        failed.append(i)
+                self._flush_quotes(force=True)
+                remaining = failed
 
-                except Exception as e:
-                    logger.warning(f"Quote failed for {token.get('symbol', '?')}: {e}")
-                    self.quote_ready.emit(i, {
-                        'status': 'error',
-                        'reason': str(e)[:100],
-                    })
+            if self.swap_mode == "auto" and wins:
+                _PREFERRED_SOURCE[self.chain_id] = "kyber" if wins.get("kyber") else "onchain"
 
-            self.all_done.emit(total_usd)
+            self.all_done.emit()
 
         except Exception as e:
             logger.error(f"QuoteWorker error: {e}", exc_info=True)
-            self.all_done.emit(0.0)
+            self.all_done.emit()
         except BaseException as e:
             logger.critical(f"BaseException in QuoteWorker: {e}", exc_info=True)
             try:
-                self.all_done.emit(0.0)
+                self.all_done.emit()
             except Exception:
                 pass
 
-    def _get_best_quote(self, swapper: DexSwap, token_address: str, amount: int) -> Optional[dict]:
-        """Получить лучшую котировку в зависимости от swap_mode."""
-
-        def _make_result(amount_out: int, route: str, source: str, price_impact: float = 0) -> Optional[dict]:
-            if amount_out <= 0:
-                return None
-            try:
-                out_decimals = swapper.get_token_decimals(self.output_token)
-                out_human = amount_out / (10 ** out_decimals)
-            except Exception:
-                out_human = 0.0
-            return {
-                'status': 'ok',
-                'amount_out': amount_out,
-                'amount_out_human': out_human,
-                'route': route,
-                'price_impact': price_impact,
-                'source': source,
+    def _kyber_quotes(self, swapper: DexSwap, indices: List[int]):
+        """Котировки KyberSwap для токенов по индексам; yield (index, quote_data) по мере готовности."""
+        # Котировки идут параллельно — общее время ≈ самая медленная котировка.
+        # Один DexSwap на все потоки: контракты и ABI неизменяемы, пул соединений urllib3
+        # потокобезопасен, cookies Kyber-сессия не хранит — своя копия на поток не нужна.
+        max_workers = min(_MAX_QUOTE_THREADS, len(indices))
+        # Дедлайн у каждой котировки свой и считается с момента, когда поток её взял,
+        # а не с постановки в очередь — токены из хвоста очереди не теряют время
+        started = {}  # index -> time.monotonic() старта в потоке пула
+
+        def quote_one(i):
+            started[i] = time.monotonic()
+            return self._kyber_quote_one(swapper, self.tokens[i])
+
+        def timed_out(i):
+            logger.warning(f"Quote timed out for {self.tokens[i].get('symbol', '?')}")
+            return i, {
+                'status': 'error',
+                'reason': 'timeout',
             }
 
-        def _try_kyber():
-            kyber_quote = swapper.get_kyber_quote(token_address, self.output_token, amount)
+        ex = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quote")
+        try:
+            futures = {ex.submit(quote_one, i): i for i in indices}
+            pending = set(futures)
+            hung = set()  # просроченные котировки, чьи потоки ещё заняты
+            while pending:
+                if self.isInterruptionRequested():
+                    return
+                # Просыпаемся и без новых результатов, чтобы вовремя отдать неполную пачку
+                # и проверить дедлайны
+                done, pending = wait(pending, timeout=_QUOTE_BATCH_INTERVAL_SEC,
+                                     return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield futures[fut], fut.result()
+
+                # Зависшие котировки — ошибка только для своих строк, остальные уже показаны
+                now = time.monotonic()
+                for fut in [f for f in pending
+                            if now - started.get(futures[f], now) >= _QUOTE_TIMEOUT_SEC]:
+                    pending.discard(fut)
+                    hung.add(fut)
+                    yield timed_out(futures[fut])
+                # Все потоки заняты зависшими запросами — оставшимся из очереди не стартовать
+                hung = {f for f in hung if not f.done()}
+                if len(hung) >= max_workers:
+                    for fut in pending:
+                        fut.cancel()
+                        yield timed_out(futures[fut])
+                    pending = set()
+                self._flush_quotes()
+        finally:
+            # Не ждём зависшие потоки — они завершатся сами по таймауту HTTP
+            ex.shutdown(wait=False, cancel_futures=True)
+
+    def _kyber_quote_one(self, swapper: DexSwap, token: dict) -> dict:
+        """Котировка KyberSwap для одного токена (выполняется в потоке пула)."""
+        try:
+            kyber_quote = swapper.get_kyber_quote(
+                token['address'], self.output_token, token['amount'], to_decimals=self._out_decimals
+            )
             if kyber_quote and kyber_quote.amount_out > 0:
                 return {
                     'status': 'ok',
@@ -114,36 +303,151 @@ class QuoteWorker(QThread):
                     'price_impact': kyber_quote.price_impact,
                     'source': 'KyberSwap',
                 }
-            return None
+            return {
+                'status': 'error',
+                'reason': 'No liquidity',
+            }
+        except Exception as e:
+            logger.warning(f"Quote failed for {token.get('symbol', '?')}: {e}")
+            return {
+                'status': 'error',
+                'reason': str(e)[:100],
+            }
+
+    def _onchain_quotes(self, swapper: DexSwap, indices: List[int]):
+        """Котировки V2/V3 для токенов по индексам одним батчем; yield (index, quote_data)."""
+        try:
+            batch = swapper.get_quotes_batch(
+                [(self.tokens[i]['address'], self.tokens[i]['amount']) for i in indices],
+                self.output_token,
+                include_v2=self.swap_mode != "v3",
+                include_v3=self.swap_mode != "v2",
+            )
+        except Exception as e:
+            logger.warning(f"Batched V2/V3 quotes failed: {e}")
+            for i in indices:
+                yield i, {
+                    'status': 'error',
+                    'reason': str(e)[:100],
+                }
+            return
+
+        for i, quotes in zip(indices, batch):
+            # Порядок как в Auto: V2, затем V3
+            result = self._make_result(quotes['v2'], 'V2', 'V2')
+            if result is None:
+                v3_out, fee, _ = quotes['v3']
+                result = self._make_result(v3_out, f'V3 (fee {fee/10000:.2f}%)', 'V3')
+            yield i, result or {
+                'status': 'error',
+                'reason': 'No liquidity',
+            }
 
-        def _try_v2():
-            v2_out = swapper.get_quote(token_address, self.output_token, amount)
-            return _make_result(v2_out, 'V2', 'V2')
+    def _stable_result(self, token: dict) -> dict:
+        """Котировка 1:1 для USD-стейбла/выходного токена — без запросов."""
+        amount = token['amount']
+        decimals = token.get('decimals', 18)
+        amount_out = amount
+        if self._out_decimals is not None and self._out_decimals != decimals:
+            amount_out = amount * (10 ** self._out_decimals) // (10 ** decimals)
+        return {
+            'status': 'ok',
+            'amount_out': amount_out,
+            'amount_out_human': amount / (10 ** decimals),
+            'route': 'Stable 1:1',
+            'price_impact': 0,
+            'source': 'stable',
+        }
+
+    def _make_result(self, amount_out: int, route: str, source: str,
+                     price_impact: float = 0) -> Optional[dict]:
+        if amount_out <= 0:
+            return None
+        if self._out_decimals is not None:
+            out_human = amount_out / (10 ** self._out_decimals)
+        else:
+            out_human = 0.0
+        return {
+            'status': 'ok',
+            'amount_out': amount_out,
+            'amount_out_human': out_human,
+            'route': route,
+            'price_impact': price_impact,
+            'source': source,
+        }
+
+
+class QuotesModel(QAbstractTableModel):
+    """
+    Модель таблицы предпросмотра: колонки хранятся параллельными списками строк,
+    без объекта-ячейки на каждую клетку.
+    """
 
-        def _try_v3():
-            if not swapper.v3_available:
-                return None
-            v3_out, fee, _ = swapper.get_quote_v3(token_address, self.output_token, amount)
-            return _make_result(v3_out, f'V3 (fee {fee/10000:.2f}%)', 'V3')
+    HEADERS = ("Токен", "Баланс", "Получите", "Маршрут")
 
-        # Принудительный режим
-        if self.swap_mode == "kyber":
-            return _try_kyber()
-        if self.swap_mode == "v2":
-            return _try_v2()
-        if self.swap_mode == "v3":
-            return _try_v3()
+    # Кисти на все строки общие: ForegroundRole отдаёт готовый QBrush без конвертации на отрисовке
+    _LOADING_BRUSH = QBrush(QColor(Qt.GlobalColor.gray))
+    _OK_BRUSH = QBrush(QColor(Qt.GlobalColor.darkGreen))
+    _ERROR_BRUSH = QBrush(QColor(Qt.GlobalColor.red))
 
-        # Auto: Kyber → V2 → V3
-        result = _try_kyber()
-        if result:
-            return result
+    # Нефинальные состояния: (текст «Получите», кисть «Получите», кисть «Маршрут»)
+    _SKIP_STATE = ("Пропуск", _LOADING_BRUSH, None)
+    _ERROR_STATE = ("Ошибка", _ERROR_BRUSH, _ERROR_BRUSH)
 
-        result = _try_v2()
-        if result:
-            return result
+    def __init__(self, tokens: list, parent=None):
+        super().__init__(parent)
+        n = len(tokens)
+        self.symbols = [t.get('symbol', '?') for t in tokens]
+        self.balances = [_format_balance(t.get('amount', 0), t.get('decimals', 18)) for t in tokens]
+        self.outs = ["Загрузка..."] * n
+        self.routes = ["..."] * n
+        self.out_colors = [self._LOADING_BRUSH] * n
+        self.route_colors = [None] * n
+        self._columns = (self.symbols, self.balances, self.outs, self.routes)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.symbols)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._columns[col][row]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if col == 2:
+                return self.out_colors[row]
+            if col == 3:
+                return self.route_colors[row]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def set_quote(self, row: int, data: dict):
+        """Записать котировку в строку (без сигнала — см. rows_changed)."""
+        status = data.get('status', 'error')
+        if status == 'ok':
+            self.outs[row] = f"~${data.get('amount_out_human', 0):,.2f}"
+            self.out_colors[row] = self._OK_BRUSH
+            self.routes[row] = data.get('route', 'KyberSwap')
+            self.route_colors[row] = None
+            return
+        if status == 'skip':
+            state, reason = self._SKIP_STATE, data.get('reason', '')
+        else:  # error
+            state, reason = self._ERROR_STATE, data.get('reason', 'Unknown error')
+        self.outs[row], self.out_colors[row], self.route_colors[row] = state
+        self.routes[row] = reason
 
-        return _try_v3()
+    def rows_changed(self, first: int, last: int):
+        """Один dataChanged на диапазон строк с котировками."""
+        self.dataChanged.emit(self.index(first, 2), self.index(last, 3))
 
 
 class SwapPreviewDialog(QDialog):
@@ -157,6 +461,21 @@ class SwapPreviewDialog(QDialog):
     # Сигнал: юзер подтвердил свап (передаёт список токенов с котировками)
     confirmed = pyqtSignal(list)
 
+    # Шрифты одинаковы для всех экземпляров — создаются при первом открытии
+    # (QFont нельзя строить до QApplication, поэтому не на уровне модуля)
+    _TITLE_FONT = None
+    _TOTAL_FONT = None
+
+    @classmethod
+    def _init_fonts(cls):
+        if cls._TITLE_FONT is None:
+            title_font = QFont()
+            title_font.setBold(True)
+            title_font.setPointSize(11)
+            total_font = QFont()
+            total_font.setBold(True)
+            cls._TITLE_FONT, cls._TOTAL_FONT = title_font, total_font
+
     def __init__(self, parent, tokens: list, chain_id: int, w3,
                  output_token: str, slippage: float = 3.0,
                  max_price_impact: float = 5.0, proxy: dict = None,
@@ -184,7 +503,9 @@ class SwapPreviewDialog(QDialog):
         self.swap_mode = swap_mode
         self.quotes = {}  # {row_index: quote_data}
         self.quote_worker = None
-        self.total_usd = 0.0
+        self.total_usd = 0.0  # сумма успешных котировок, растёт по мере прихода
+        self._confirmed_tokens = {}  # {row_index: token + котировка} — только status == 'ok'
+        self._finalized = False  # итог уже показан (по последней котировке или по all_done)
 
         self._init_ui()
         self._load_quotes()
@@ -196,19 +517,17 @@ class SwapPreviewDialog(QDialog):
         self.setModal(True)
 
         layout = QVBoxLayout(self)
+        self._init_fonts()
 
         # Заголовок
         title = QLabel("Предпросмотр свапа токенов")
-        title_font = QFont()
-        title_font.setBold(True)
-        title_font.setPointSize(11)
-        title.setFont(title_font)
+        title.setFont(self._TITLE_FONT)
         layout.addWidget(title)
 
         # Таблица котировок
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Токен", "Баланс", "Получите", "Маршрут"])
+        self.model = QuotesModel(self.tokens, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
@@ -217,30 +536,11 @@ class SwapPreviewDialog(QDialog):
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
 
-        # Заполнить строки
-        self.table.setRowCount(len(self.tokens))
-        for i, token in enumerate(self.tokens):
-            # Токен
-            self.table.setItem(i, 0, QTableWidgetItem(token.get('symbol', '?')))
-            # Баланс
-            amount = token.get('amount', 0)
-            decimals = token.get('decimals', 18)
-            balance_str = f"{amount / (10 ** decimals):,.6f}"
-            self.table.setItem(i, 1, QTableWidgetItem(balance_str))
-            # Получите — загружается
-            loading_item = QTableWidgetItem("Загрузка...")
-            loading_item.setForeground(Qt.GlobalColor.gray)
-            self.table.setItem(i, 2, loading_item)
-            # Маршрут — загружается
-            self.table.setItem(i, 3, QTableWidgetItem("..."))
-
         layout.addWidget(self.table)
 
         # Итого
         self.total_label = QLabel("Итого: загрузка...")
-        total_font = QFont()
-        total_font.setBold(True)
-        self.total_label.setFont(total_font)
+        self.total_label.setFont(self._TOTAL_FONT)
         layout.addWidget(self.total_label)
 
         # Slippage + swap mode info
@@ -281,50 +581,44 @@ class SwapPreviewDialog(QDialog):
             self.max_price_impact, proxy=self.proxy,
             swap_mode=self.swap_mode
         )
-        self.quote_worker.quote_ready.connect(self._on_quote_ready, Qt.ConnectionType.QueuedConnection)
+        self.quote_worker.quotes_batch.connect(self._on_quotes_batch, Qt.ConnectionType.QueuedConnection)
         self.quote_worker.all_done.connect(self._on_all_quotes_done, Qt.ConnectionType.QueuedConnection)
         self.quote_worker.start()
 
-    def _on_quote_ready(self, row: int, data: dict):
-        """Обновить строку таблицы с котировкой."""
-        self.quotes[row] = data
+    def _on_quotes_batch(self, batch: list):
+        """Применить пачку котировок одним dataChanged."""
+        if not batch:
+            return
+        for row, data in batch:
+            self.quotes[row] = data
+            self.model.set_quote(row, data)
+            if data.get('status') == 'ok':
+                self.total_usd += data.get('amount_out_human', 0)
+                self._confirmed_tokens[row] = {
+                    **self.tokens[row],
+                    'expected_out': data.get('amount_out', 0),
+                    'expected_usd': data.get('amount_out_human', 0),
+                    'route': data.get('route', ''),
+                }
+        rows = [row for row, _ in batch]
+        self.model.rows_changed(min(rows), max(rows))
         self.progress.setValue(len(self.quotes))
+        if len(self.quotes) == len(self.tokens):
+            # Котировки есть для всех строк — не ждём all_done через очередь событий
+            self._on_all_quotes_done()
+        elif self._confirmed_tokens:
+            self.total_label.setText(f"Итого: ~${self.total_usd:,.2f}")
 
-        status = data.get('status', 'error')
-
-        if status == 'ok':
-            out_human = data.get('amount_out_human', 0)
-            item = QTableWidgetItem(f"~${out_human:,.2f}")
-            item.setForeground(Qt.GlobalColor.darkGreen)
-            self.table.setItem(row, 2, item)
-
-            route = data.get('route', 'KyberSwap')
-            route_item = QTableWidgetItem(route)
-            self.table.setItem(row, 3, route_item)
-
-        elif status == 'skip':
-            item = QTableWidgetItem("Пропуск")
-            item.setForeground(Qt.GlobalColor.gray)
-            self.table.setItem(row, 2, item)
-            self.table.setItem(row, 3, QTableWidgetItem(data.get('reason', '')))
-
-        else:  # error
-            item = QTableWidgetItem("Ошибка")
-            item.setForeground(Qt.GlobalColor.red)
-            self.table.setItem(row, 2, item)
-            reason = data.get('reason', 'Unknown error')
-            reason_item = QTableWidgetItem(reason)
-            reason_item.setForeground(Qt.GlobalColor.red)
-            self.table.setItem(row, 3, reason_item)
-
-    def _on_all_quotes_done(self, total_usd: float):
+    def _on_all_quotes_done(self):
         """Все котировки загружены."""
-        self.total_usd = total_usd
-        self.total_label.setText(f"Итого: ~${total_usd:,.2f}")
+        if self._finalized:
+            return
+        self._finalized = True
+        self.total_label.setText(f"Итого: ~${self.total_usd:,.2f}")
         self.progress.hide()
 
         # Включить кнопку если есть хоть одна успешная котировка
-        has_any_ok = any(q.get('status') == 'ok' for q in self.quotes.values())
+        has_any_ok = bool(self._confirmed_tokens)
         self.confirm_btn.setEnabled(has_any_ok)
 
         if not has_any_ok:
@@ -333,17 +627,8 @@ class SwapPreviewDialog(QDialog):
 
     def _on_confirm(self):
         """Юзер подтвердил свап."""
-        # Собрать токены с успешными котировками
-        confirmed_tokens = []
-        for i, token in enumerate(self.tokens):
-            quote = self.quotes.get(i, {})
-            if quote.get('status') == 'ok':
-                confirmed_tokens.append({
-                    **token,
-                    'expected_out': quote.get('amount_out', 0),
-                    'expected_usd': quote.get('amount_out_human', 0),
-                    'route': quote.get('route', ''),
-                })
+        # Токены с успешными котировками собраны по мере прихода — в исходном порядке
+        confirmed_tokens = [self._confirmed_tokens[i] for i in sorted(self._confirmed_tokens)]
 
         self.confirmed.emit(confirmed_tokens)
         self.accept()
@@ -354,24 +639,31 @@ class SwapPreviewDialog(QDialog):
         self.reject()
 
     def _cleanup_quote_worker(self):
-        """Stop and clean up the quote worker if running.
+        """Stop and clean up the quote worker if running — without blocking the GUI.
 
-        H6-safe: never deleteLater() while the thread is still executing.
-        For long-running quote chains (3-5 sequential HTTP calls, 8-15s
-        on slow proxies) wait(5000) often times out — defer destruction
-        to the `finished` signal in that case.
+        The worker is asked to stop via requestInterruption() and checks it
+        between quote sources and on every batch tick; in-flight HTTP calls
+        are bounded by their own timeouts. H6-safe: a still-running worker is
+        deleted from its `finished` signal, never while run() is executing.
         """
         w = self.quote_worker
         if w is None:
             return
         self.quote_worker = None
+        try:
+            w.quotes_batch.disconnect(self._on_quotes_batch)
+            w.all_done.disconnect(self._on_all_quotes_done)
+        except (TypeError, RuntimeError):
+            pass
         try:
             if w.isRunning():
-                w.quit()
-                w.wait(5000)
-            if w.isRunning():
-                # Still alive — defer destruction until run() returns.
+                w.requestInterruption()
+                _DETACHED_WORKERS.add(w)
+                w.finished.connect(lambda: _DETACHED_WORKERS.discard(w))
                 w.finished.connect(w.deleteLater)
+                if w.isFinished():  # успел завершиться до подключения к finished
+                    _DETACHED_WORKERS.discard(w)
+                    w.deleteLater()
             else:
                 w.deleteLater()
         except RuntimeError:
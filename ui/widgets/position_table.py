@@ -5,13 +5,174 @@ Displays bid-ask ladder positions in a formatted table.
 """
 
 from PyQt6.QtWidgets import (
-    QTableWidget, QTableWidgetItem, QWidget, QVBoxLayout,
-    QHeaderView, QProgressBar, QHBoxLayout, QLabel
+    QTableView, QWidget, QVBoxLayout, QHeaderView, QLabel, QStyledItemDelegate
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRectF, QTimer
+from PyQt6.QtGui import QColor, QPainter, QBrush
 from typing import List, Optional
 
+from src.math.distribution import LadderStats, ladder_stats
+
+
+# Colors and alignments shared by every row (built once, not per cell)
+_GREEN = QColor("#00b894")
+_YELLOW = QColor("#fdcb6e")
+_RED = QColor("#e94560")
+_TRACK = QColor("#0f3460")
+_ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
+_ALIGN_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+# TextAlignmentRole per column (None = view default)
+_COLUMN_ALIGNMENT = (_ALIGN_CENTER, None, _ALIGN_CENTER, _ALIGN_RIGHT, _ALIGN_CENTER, None)
+
+# Column layout: headers, header resize mode per column, fixed widths
+_HEADERS = ("#", "Price Range", "From Current", "USD", "%", "Distribution")
+_FIXED = QHeaderView.ResizeMode.Fixed
+_STRETCH = QHeaderView.ResizeMode.Stretch
+_COL_MODES = ((0, _FIXED), (1, _STRETCH), (2, _FIXED), (3, _FIXED), (4, _FIXED), (5, _STRETCH))
+_COL_WIDTHS = ((0, 40), (2, 100), (3, 100), (4, 60))
+
+
+def _format_price(price: float) -> str:
+    """Format price with appropriate decimal places."""
+    if price == 0:
+        return "$0"
+    elif price >= 1000:
+        return f"${price:,.2f}"
+    elif price >= 1:
+        return f"${price:.4f}"
+    elif price >= 0.01:
+        return f"${price:.6f}"
+    else:
+        return f"${price:.8f}"
+
+
+class PositionTableModel(QAbstractTableModel):
+    """
+    Table model for ladder positions.
+
+    Display strings are built once per set_positions(); data() only indexes
+    into them. Column 5 exposes the bar fill (0-100) via UserRole for BarDelegate.
+    """
+
+    HEADERS = _HEADERS
+    BAR_COLUMN = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []        # [(index, range, from_current, usd, percent), ...]
+        self._colors = []      # foreground for "From Current"
+        self._bar_values = []  # usd_amount / max_usd * 100
+
+    def set_positions(self, positions: List, current_price: Optional[float] = None,
+                      max_usd: Optional[float] = None):
+        """Rebuild rows from BidAskPosition objects (max_usd: largest usd_amount, if known)."""
+        rows = []
+        colors = []
+        bar_values = []
+        if max_usd is None:
+            max_usd = max((p.usd_amount for p in positions), default=0)
+        max_usd = max_usd or 1
+        for pos in positions:
+            if current_price:
+                mid_price = (pos.price_lower + pos.price_upper) / 2
+                pct_from_current = ((mid_price - current_price) / current_price) * 100
+                pct_text = f"{pct_from_current:+.1f}%"
+                # Color based on distance
+                if pct_from_current > -10:
+                    color = _GREEN   # close
+                elif pct_from_current > -30:
+                    color = _YELLOW  # medium
+                else:
+                    color = _RED     # far
+            else:
+                pct_text = "-"
+                color = None
+
+            rows.append((
+                str(pos.index + 1),
+                f"{_format_price(pos.price_lower)} - {_format_price(pos.price_upper)}",
+                pct_text,
+                f"${pos.usd_amount:,.2f}",
+                f"{pos.percentage:.1f}%",
+            ))
+            colors.append(color)
+            bar_values.append(pos.usd_amount / max_usd * 100)
+        if rows and len(rows) == len(self._rows):
+            # Same ladder size (the usual case) — update cells in place: no reset,
+            # selection and scroll position survive, no row relayout
+            self._rows = rows
+            self._colors = colors
+            self._bar_values = bar_values
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(len(rows) - 1, len(self.HEADERS) - 1)
+            )
+            return
+        self.beginResetModel()
+        self._rows = rows
+        self._colors = colors
+        self._bar_values = bar_values
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col < self.BAR_COLUMN:
+                return self._rows[row][col]
+            return None
+        if role == Qt.ItemDataRole.UserRole and col == self.BAR_COLUMN:
+            return self._bar_values[row]
+        if role == Qt.ItemDataRole.ForegroundRole and col == 2:
+            return self._colors[row]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _COLUMN_ALIGNMENT[col]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
+class BarDelegate(QStyledItemDelegate):
+    """Paints the distribution bar directly — no QProgressBar widget per row."""
+
+    # Prebuilt brushes: track + chunk by bucket (<=33 / <=66 / >66 %)
+    _TRACK_BRUSH = QBrush(_TRACK)
+    _BAR_BRUSHES = (QBrush(_GREEN), QBrush(_YELLOW), QBrush(_RED))
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        percentage = index.data(Qt.ItemDataRole.UserRole)
+        if percentage is None:
+            return
+
+        # Same geometry as the old cell widget: 5/2 px margins, bar up to 15 px high
+        rect = QRectF(option.rect.adjusted(5, 2, -5, -2))
+        height = min(rect.height(), 15)
+        rect.setTop(rect.center().y() - height / 2)
+        rect.setHeight(height)
+
+        bucket = 2 if percentage > 66 else 1 if percentage > 33 else 0
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._TRACK_BRUSH)
+        painter.drawRoundedRect(rect, 4, 4)
+        chunk_width = rect.width() * max(0.0, min(percentage, 100.0)) / 100
+        if chunk_width > 0:
+            painter.setBrush(self._BAR_BRUSHES[bucket])
+            painter.drawRoundedRect(QRectF(rect.left(), rect.top(), chunk_width, height), 4, 4)
+        painter.restore()
+
 
 class PositionTableWidget(QWidget):
     """
@@ -20,22 +181,21 @@ class PositionTableWidget(QWidget):
     Shows: Index, Price Range, USD Amount, Percentage, Visual Bar
     """
 
+    # Min interval between table rebuilds: the first update applies at once,
+    # further ones within the window collapse into the latest
+    APPLY_INTERVAL_MS = 50
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._pending = None  # (positions, current_price, stats) waiting for the window to close
+        self._last_summary_key = None  # inputs of the text currently in summary_label
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(self.APPLY_INTERVAL_MS)
+        self._apply_timer.timeout.connect(self._apply_pending)
         self.setup_ui()
 
-    def _format_price(self, price: float) -> str:
-        """Format price with appropriate decimal places."""
-        if price == 0:
-            return "$0"
-        elif price >= 1000:
-            return f"${price:,.2f}"
-        elif price >= 1:
-            return f"${price:.4f}"
-        elif price >= 0.01:
-            return f"${price:.6f}"
-        else:
-            return f"${price:.8f}"
+    _format_price = staticmethod(_format_price)
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -47,135 +207,80 @@ class PositionTableWidget(QWidget):
         layout.addWidget(self.summary_label)
 
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "#", "Price Range", "From Current", "USD", "%", "Distribution"
-        ])
+        self.model = PositionTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self._bar_delegate = BarDelegate(self.table)
+        self.table.setItemDelegateForColumn(PositionTableModel.BAR_COLUMN, self._bar_delegate)
 
         # Configure columns
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
-
-        self.table.setColumnWidth(0, 40)
-        self.table.setColumnWidth(2, 100)
-        self.table.setColumnWidth(3, 100)
-        self.table.setColumnWidth(4, 60)
-
-        # Disable editing
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setAlternatingRowColors(False)  # Disabled - dark theme looks better without
+        for col, mode in _COL_MODES:
+            header.setSectionResizeMode(col, mode)
+        for col, width in _COL_WIDTHS:
+            self.table.setColumnWidth(col, width)
+
+        # Disable editing (alternating row colors are off by default — dark theme looks better without)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
 
         layout.addWidget(self.table)
 
-    def set_positions(self, positions: List, current_price: Optional[float] = None):
+    def set_positions(self, positions: List, current_price: Optional[float] = None,
+                      stats: Optional[LadderStats] = None):
         """
         Populate table with position data.
 
         Args:
             positions: List of BidAskPosition objects
             current_price: Current price for calculating % from current
+            stats: Precomputed ladder_stats(positions), if the caller has it
         """
-        self.table.setRowCount(len(positions))
+        self._pending = (positions, current_price, stats)
+        if not self._apply_timer.isActive():
+            self._apply_pending()
+            self._apply_timer.start()
 
-        total_usd = sum(p.usd_amount for p in positions)
-        max_usd = max(p.usd_amount for p in positions) if positions else 1
+    def _apply_pending(self):
+        """Apply the latest set_positions() arguments, if any."""
+        if self._pending is None:
+            return
+        positions, current_price, stats = self._pending
+        self._pending = None
 
-        for row, pos in enumerate(positions):
-            # Index
-            index_item = QTableWidgetItem(str(pos.index + 1))
-            index_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 0, index_item)
+        # One repaint for the model reset + summary. Model signals stay live —
+        # the view needs modelReset to pick up the new rows.
+        self.table.setUpdatesEnabled(False)
+        try:
+            if stats is None:
+                stats = ladder_stats(positions)
 
-            # Price Range - use smart formatting for small prices
-            price_range = f"{self._format_price(pos.price_lower)} - {self._format_price(pos.price_upper)}"
-            self.table.setItem(row, 1, QTableWidgetItem(price_range))
+            self.model.set_positions(positions, current_price, stats.max_usd)
 
-            # From Current %
-            if current_price:
-                mid_price = (pos.price_lower + pos.price_upper) / 2
-                pct_from_current = ((mid_price - current_price) / current_price) * 100
-                pct_text = f"{pct_from_current:+.1f}%"
-                pct_item = QTableWidgetItem(pct_text)
+            self._update_summary(len(positions), stats)
+        finally:
+            self.table.setUpdatesEnabled(True)
 
-                # Color based on distance
-                if pct_from_current > -10:
-                    pct_item.setForeground(QColor("#00b894"))  # Green - close
-                elif pct_from_current > -30:
-                    pct_item.setForeground(QColor("#fdcb6e"))  # Yellow - medium
-                else:
-                    pct_item.setForeground(QColor("#e94560"))  # Red - far
-
-                pct_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 2, pct_item)
-            else:
-                self.table.setItem(row, 2, QTableWidgetItem("-"))
-
-            # USD Amount
-            usd_item = QTableWidgetItem(f"${pos.usd_amount:,.2f}")
-            usd_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.table.setItem(row, 3, usd_item)
-
-            # Percentage
-            pct_item = QTableWidgetItem(f"{pos.percentage:.1f}%")
-            pct_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 4, pct_item)
-
-            # Distribution bar
-            bar_widget = self._create_bar_widget(pos.usd_amount / max_usd * 100)
-            self.table.setCellWidget(row, 5, bar_widget)
-
-        # Update summary
-        if positions:
-            min_price = min(p.price_lower for p in positions)
-            max_price = max(p.price_upper for p in positions)
+    def _update_summary(self, count: int, stats: LadderStats):
+        """Set the summary text, skipping setText when its inputs are unchanged
+        (e.g. a price tick that only moves the "From Current" column)."""
+        key = (count, stats.total_usd, stats.min_price_lower, stats.max_price_upper)
+        if key == self._last_summary_key:
+            return
+        self._last_summary_key = key
+        if count:
             self.summary_label.setText(
-                f"Total: ${total_usd:,.2f} | "
-                f"Positions: {len(positions)} | "
-                f"Range: {self._format_price(min_price)} - {self._format_price(max_price)}"
+                f"Total: ${stats.total_usd:,.2f} | "
+                f"Positions: {count} | "
+                f"Range: {self._format_price(stats.min_price_lower)} - "
+                f"{self._format_price(stats.max_price_upper)}"
             )
         else:
             self.summary_label.setText("No positions")
 
-    def _create_bar_widget(self, percentage: float) -> QWidget:
-        """Create a progress bar widget for distribution visualization."""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 2, 5, 2)
-
-        bar = QProgressBar()
-        bar.setRange(0, 100)
-        bar.setValue(int(percentage))
-        bar.setTextVisible(False)
-        bar.setMaximumHeight(15)
-
-        # Style based on percentage
-        if percentage > 66:
-            bar.setStyleSheet("""
-                QProgressBar { background-color: #0f3460; border-radius: 4px; }
-                QProgressBar::chunk { background-color: #e94560; border-radius: 4px; }
-            """)
-        elif percentage > 33:
-            bar.setStyleSheet("""
-                QProgressBar { background-color: #0f3460; border-radius: 4px; }
-                QProgressBar::chunk { background-color: #fdcb6e; border-radius: 4px; }
-            """)
-        else:
-            bar.setStyleSheet("""
-                QProgressBar { background-color: #0f3460; border-radius: 4px; }
-                QProgressBar::chunk { background-color: #00b894; border-radius: 4px; }
-            """)
-
-        layout.addWidget(bar)
-        return widget
-
     def clear(self):
         """Clear all positions from the table."""
-        self.table.setRowCount(0)
-        self.summary_label.setText("No positions")
+        self._pending = None
+        self._apply_timer.stop()
+        self.model.set_positions([])
+        self._update_summary(0, ladder_stats([]))
@@ -5,10 +5,15 @@ Visual representation of the bid-ask ladder on a price scale.
 """
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QPainter, QColor, QPen, QBrush, QFont, QLinearGradient
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtGui import (
+    QPainter, QColor, QPen, QBrush, QFont, QFontMetricsF, QLinearGradient, QGradient,
+    QPainterPath, QStaticText, QTransform
+)
 from typing import List, Optional
 
+from src.math.distribution import LadderStats, ladder_stats
+
 
 class PriceChartWidget(QWidget):
     """
@@ -22,27 +27,83 @@ class PriceChartWidget(QWidget):
         super().__init__(parent)
         self.positions = []
         self.current_price = None
+        self._stats = None  # ladder_stats(self.positions), computed lazily on the next paint
+        self._bar_rows = None  # (geometry key, [(y_top, y_bottom, usd), ...]) from the last paint
+        self._grid = None  # (price range key, [(label pos, label text, line y), ...])
         self.setMinimumHeight(300)
         self.setMinimumWidth(200)
 
-    def set_data(self, positions: List, current_price: Optional[float] = None):
+        # Paint resources are constant — build them once, not on every paintEvent
+        self._bg = QColor("#16213e")
+        self._color_placeholder = QColor("#606070")
+        self._color_title = QColor("#e94560")
+        self._color_label = QColor("#a0a0a0")
+        self._color_current = QColor("#00b894")
+        self._color_white = QColor("#ffffff")
+        self._color_bar_start = QColor("#e94560")
+        self._color_bar_end = QColor("#0f3460")
+        self._font_placeholder = QFont("Segoe UI", 12)
+        self._font_title = QFont("Segoe UI", 11, QFont.Weight.Bold)
+        self._font_label = QFont("Segoe UI", 9)
+        self._font_current = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self._font_bar = QFont("Segoe UI", 8)
+        self._pen_axis = QPen(QColor("#0f3460"), 2)
+        self._pen_grid = QPen(QColor("#0f3460"), 1, Qt.PenStyle.DotLine)
+        self._pen_current = QPen(self._color_current, 2, Qt.PenStyle.DashLine)
+        # One left-to-right gradient for every bar: in ObjectBoundingMode it spans
+        # whatever rect it fills, so the brush never has to be rebuilt per bar
+        self._bar_gradient = QLinearGradient(0, 0, 1, 0)
+        self._bar_gradient.setCoordinateMode(QGradient.CoordinateMode.ObjectBoundingMode)
+        self._bar_gradient.setColorAt(0, self._color_bar_start)
+        self._bar_gradient.setColorAt(1, self._color_bar_end)
+        self._bar_brush = QBrush(self._bar_gradient)
+
+        # Laid-out label text, reused across frames: {text: QStaticText} per font
+        self._label_texts = {}
+        self._bar_texts = {}
+        self._label_ascent = QFontMetricsF(self._font_label).ascent()
+        self._bar_ascent = QFontMetricsF(self._font_bar).ascent()
+
+    def set_data(self, positions: List, current_price: Optional[float] = None,
+                 stats: Optional[LadderStats] = None):
         """
         Set position data for visualization.
 
         Args:
             positions: List of BidAskPosition objects
             current_price: Current market price
+            stats: Precomputed ladder_stats(positions), if the caller has it
         """
         self.positions = positions
         self.current_price = current_price
+        # No work here beyond storing: update() is coalesced by Qt, so several
+        # set_data calls before the next frame cost one paint and one stats pass
+        self._stats = stats
+        self._bar_rows = None
         self.update()
 
     def clear(self):
         """Clear all data."""
         self.positions = []
         self.current_price = None
+        self._stats = None
+        self._bar_rows = None
         self.update()
 
+    _STATIC_TEXT_CACHE_MAX = 512
+
+    def _static_text(self, cache: dict, text: str, font: QFont) -> QStaticText:
+        """QStaticText for text in font — glyph layout done once, then cached."""
+        st = cache.get(text)
+        if st is None:
+            if len(cache) >= self._STATIC_TEXT_CACHE_MAX:
+                cache.clear()
+            st = QStaticText(text)
+            st.setTextFormat(Qt.TextFormat.PlainText)
+            st.prepare(QTransform(), font)
+            cache[text] = st
+        return st
+
     @staticmethod
     def _format_price(price: float) -> str:
         """Format price without scientific notation, handling sub-dollar prices."""
@@ -58,18 +119,52 @@ class PriceChartWidget(QWidget):
         else:
             return f"{price:.10f}".rstrip('0').rstrip('.')
 
+    def _pixel_rows(self, chart_height: int, y_scale: float, y_offset: float) -> list:
+        """
+        Bar rows as [(y_top, y_bottom, usd), ...] in widget coordinates.
+
+        With more rungs than pixel rows, rungs whose top edge lands on the same
+        pixel row are merged into one bar (USD summed), so the number of bars
+        drawn never exceeds the chart height. Cached until the data or the
+        geometry changes.
+        """
+        key = (chart_height, y_scale, y_offset)
+        if self._bar_rows is not None and self._bar_rows[0] == key:
+            return self._bar_rows[1]
+
+        rows = [
+            (y_offset - pos.price_upper * y_scale,
+             y_offset - pos.price_lower * y_scale,
+             pos.usd_amount)
+            for pos in self.positions
+        ]
+        if len(rows) > chart_height:
+            buckets = {}
+            for y_top, y_bottom, usd in rows:
+                row = buckets.get(int(y_top))
+                if row is None:
+                    buckets[int(y_top)] = [y_top, y_bottom, usd]
+                else:
+                    row[0] = min(row[0], y_top)
+                    row[1] = max(row[1], y_bottom)
+                    row[2] += usd
+            rows = [tuple(row) for row in buckets.values()]
+
+        self._bar_rows = (key, rows)
+        return rows
+
     def paintEvent(self, event):
         """Custom paint event for drawing the chart."""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # Background
-        painter.fillRect(self.rect(), QColor("#16213e"))
+        painter.fillRect(self.rect(), self._bg)
 
         if not self.positions:
             # Draw placeholder text
-            painter.setPen(QColor("#606070"))
-            painter.setFont(QFont("Segoe UI", 12))
+            painter.setPen(self._color_placeholder)
+            painter.setFont(self._font_placeholder)
             painter.drawText(
                 self.rect(),
                 Qt.AlignmentFlag.AlignCenter,
@@ -86,9 +181,13 @@ class PriceChartWidget(QWidget):
         chart_width = self.width() - margin_left - margin_right
         chart_height = self.height() - margin_top - margin_bottom
 
-        # Calculate price range
-        min_price = min(p.price_lower for p in self.positions)
-        max_price = max(p.price_upper for p in self.positions)
+        # Price range and max USD (for bar scaling) — cached until the next set_data
+        stats = self._stats
+        if stats is None:
+            stats = self._stats = ladder_stats(self.positions)
+        min_price = stats.min_price_lower
+        max_price = stats.max_price_upper
+        max_usd = stats.max_usd or 1
 
         if self.current_price:
             max_price = max(max_price, self.current_price * 1.05)
@@ -97,48 +196,63 @@ class PriceChartWidget(QWidget):
         if price_range == 0:
             price_range = 1
 
-        # Calculate max USD for scaling bars
-        max_usd = max(p.usd_amount for p in self.positions)
+        # price -> y as one affine map: y = y_offset - price * y_scale
+        y_scale = chart_height / price_range
+        y_offset = margin_top + max_price * y_scale
 
         # Draw title
-        painter.setPen(QColor("#e94560"))
-        painter.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        painter.setPen(self._color_title)
+        painter.setFont(self._font_title)
         painter.drawText(10, 25, "Liquidity Distribution")
 
         # Draw price axis
-        painter.setPen(QPen(QColor("#0f3460"), 2))
+        painter.setPen(self._pen_axis)
         painter.drawLine(
             margin_left, margin_top,
             margin_left, self.height() - margin_bottom
         )
 
-        # Draw price labels
-        painter.setPen(QColor("#a0a0a0"))
-        painter.setFont(QFont("Segoe UI", 9))
-
-        num_labels = 6
-        for i in range(num_labels):
-            price = max_price - (i / (num_labels - 1)) * price_range
-            y = margin_top + (i / (num_labels - 1)) * chart_height
-
-            # Price label (smart formatting for sub-dollar prices)
-            painter.drawText(5, int(y + 4), f"${self._format_price(price)}")
-
-            # Grid line
-            painter.setPen(QPen(QColor("#0f3460"), 1, Qt.PenStyle.DotLine))
-            painter.drawLine(margin_left, int(y), self.width() - margin_right, int(y))
-            painter.setPen(QColor("#a0a0a0"))
+        # Price labels + grid lines: laid out once per price range / chart height
+        # (bar-only changes reuse them), then one pass per pen
+        grid_key = (max_price, price_range, chart_height)
+        if self._grid is None or self._grid[0] != grid_key:
+            num_labels = 6
+            grid = []
+            for i in range(num_labels):
+                price = max_price - (i / (num_labels - 1)) * price_range
+                y = margin_top + (i / (num_labels - 1)) * chart_height
+                grid.append((
+                    # drawStaticText places the top-left corner: baseline minus ascent
+                    QPointF(5, int(y + 4) - self._label_ascent),
+                    # Smart formatting for sub-dollar prices
+                    self._static_text(self._label_texts, f"${self._format_price(price)}", self._font_label),
+                    int(y),
+                ))
+            self._grid = (grid_key, grid)
+        grid = self._grid[1]
+
+        # Price labels
+        painter.setPen(self._color_label)
+        painter.setFont(self._font_label)
+        for pos, text, _ in grid:
+            painter.drawStaticText(pos, text)
+
+        # Grid lines
+        painter.setPen(self._pen_grid)
+        grid_right = self.width() - margin_right
+        for _, _, y in grid:
+            painter.drawLine(margin_left, y, grid_right, y)
 
         # Draw current price line if available
         if self.current_price and min_price <= self.current_price <= max_price:
-            y_current = margin_top + ((max_price - self.current_price) / price_range) * chart_height
+            y_current = y_offset - self.current_price * y_scale
 
-            painter.setPen(QPen(QColor("#00b894"), 2, Qt.PenStyle.DashLine))
+            painter.setPen(self._pen_current)
             painter.drawLine(margin_left, int(y_current), self.width() - margin_right, int(y_current))
 
             # Current price label
-            painter.setPen(QColor("#00b894"))
-            painter.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+            painter.setPen(self._color_current)
+            painter.setFont(self._font_current)
             painter.drawText(
                 self.width() - margin_right - 100, int(y_current - 5),
                 f"Current: ${self._format_price(self.current_price)}"
@@ -147,48 +261,82 @@ class PriceChartWidget(QWidget):
         # Draw position bars
         bar_spacing = 3
 
-        for pos in self.positions:
-            # Calculate Y positions
-            y_top = margin_top + ((max_price - pos.price_upper) / price_range) * chart_height
-            y_bottom = margin_top + ((max_price - pos.price_lower) / price_range) * chart_height
-
-            # Calculate bar width based on USD amount
-            bar_width = (pos.usd_amount / max_usd) * (chart_width - 20)
-
-            # Create gradient for bar
-            gradient = QLinearGradient(margin_left + 5, y_top, margin_left + 5 + bar_width, y_top)
-            gradient.setColorAt(0, QColor("#e94560"))
-            gradient.setColorAt(1, QColor("#0f3460"))
-
-            # Draw bar
+        # Geometry for all bars up front (Y positions, width by USD amount) —
+        # the draw loop below only issues painter calls
+        rows = self._pixel_rows(chart_height, y_scale, y_offset)
+        if len(rows) < len(self.positions):
+            # Merged rows carry summed USD — scale widths to the widest of them
+            max_usd = max(usd for _, _, usd in rows) or 1
+        bar_scale = (chart_width - 20) / max_usd
+        bars = [
+            (y_top, y_bottom, usd * bar_scale, usd)
+            for y_top, y_bottom, usd in rows
+        ]
+
+        # Bars live in the plot area; let the painter reject anything spilling past it.
+        # Vertical slack keeps the 10 px minimum-height bars and their labels at the edges.
+        plot_bottom = self.height() - margin_bottom
+        clip_slack = 20
+        painter.setClipRect(QRectF(
+            margin_left, margin_top - clip_slack,
+            self.width() - margin_left, chart_height + 2 * clip_slack
+        ))
+
+        # Skip rungs entirely outside the visible price range
+        bars = [b for b in bars if b[1] >= margin_top and b[0] <= plot_bottom]
+
+        # Bars, grouped by width. The gradient runs left-to-right across the filled
+        # shape's bounding box, so rungs of equal width (e.g. a uniform ladder) can
+        # go out as one path fill without changing how each of them is shaded.
+        groups = {}
+        for y_top, y_bottom, bar_width, usd_amount in bars:
             rect = QRectF(
                 margin_left + 5,
                 y_top + bar_spacing,
                 bar_width,
                 max(y_bottom - y_top - bar_spacing * 2, 10)
             )
-
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, 4, 4)
-
-            # Draw USD label on bar
-            painter.setPen(QColor("#ffffff"))
-            painter.setFont(QFont("Segoe UI", 8))
-
-            label_text = f"${pos.usd_amount:,.0f}"
+            groups.setdefault(bar_width, []).append(rect)
+
+        # Axis-aligned fills with a 4 px radius: edge antialiasing costs more than it
+        # shows here, so it is off for the bar pass only (lines and text keep it)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._bar_brush)
+        for rects in groups.values():
+            if len(rects) == 1:
+                painter.drawRoundedRect(rects[0], 4, 4)
+                continue
+            path = QPainterPath()
+            path.setFillRule(Qt.FillRule.WindingFill)
+            for rect in rects:
+                path.addRoundedRect(rect, 4, 4)
+            painter.drawPath(path)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+
+        # USD labels on top of all bars
+        painter.setPen(self._color_white)
+        painter.setFont(self._font_bar)
+        for y_top, y_bottom, bar_width, usd_amount in bars:
+            label_text = f"${usd_amount:,.0f}"
             text_y = (y_top + y_bottom) / 2 + 4
 
             if bar_width > 60:
                 # Draw inside bar
-                painter.drawText(int(margin_left + 10), int(text_y), label_text)
+                text_x = int(margin_left + 10)
             else:
                 # Draw outside bar
-                painter.drawText(int(margin_left + bar_width + 10), int(text_y), label_text)
+                text_x = int(margin_left + bar_width + 10)
+            painter.drawStaticText(
+                QPointF(text_x, int(text_y) - self._bar_ascent),
+                self._static_text(self._bar_texts, label_text, self._font_bar),
+            )
+
+        painter.setClipping(False)
 
         # Draw legend
         legend_y = self.height() - 20
-        painter.setFont(QFont("Segoe UI", 9))
+        painter.setFont(self._font_label)
 
-        painter.setPen(QColor("#a0a0a0"))
+        painter.setPen(self._color_label)
         painter.drawText(margin_left, legend_y, "Bar width = USD amount | Height = Price range")